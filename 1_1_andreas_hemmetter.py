@@ -16,57 +16,50 @@ print __doc__                                   # Benutzerführung
 import numpy as np								# Importbefehle	
 from matplotlib import pyplot as plt
 from random import randint						# für zufällige Farbwahl
+from standardabbildung import orbit_cache_anlegen, orbit_gecacht
+from ansicht import verfeinerung_verbinden, klick_verteiler
 
-def orbit(theta=0.0, p=0.0):
+cache = orbit_cache_anlegen()                   # bereits berechnete Orbits
+
+def orbit(theta=0.0, p=0.0, K=2.6, kicks=1000):
     """Hauptteil, Iteration über 1000 Kicks. Winkel und Impuls
     werden laut Angabe berechnet (mit periodischen Randbedingungen
 	für Winkel und Impuls) und anschließend in 2 Arrays gespeichert 
-    und geplottet."""
+    und geplottet. Die Kicks rechnet positions_batch über den Orbit-Cache,
+    der Startwert selbst wird nicht mit zurückgegeben."""
     
-    K = 2.6					                    # Kickstärke
-    x_array = []
-    y_array = []
-    kicks = np.linspace(1, 1000, 1000)          # Anzahl der Kicks
-
-    for n in kicks:
-        # Iteration über die 1000 Kicks pro Orbit
-        theta = (theta + p) % (2*np.pi)
-        p = (p + K * np.sin(theta) + np.pi) % (2*np.pi) - np.pi
-        # Implementierung der periodischen Randbedingungen
-        x_array.append(theta)
-        y_array.append(p)
+    t, p = orbit_gecacht(cache, theta, p, kicks + 1, K)
+    x_array = t[1:]
+    y_array = p[1:]
     return x_array, y_array
 
-def onclick(event):
-    """Klickposition beschreiben neue Startwerte. 
-	Koordinaten für 1000 Iterationen werden in 2 Arrays geschrieben. 
-    Bei jedem Klick wird eine zufällige Farbe aus dem farben-Array 
-    ausgewählt und der Plot damit neugezeichnet."""
-    
-    # Array mit etwas schöneren Farben (zum Zeichnen wird eine
-    # zufällige Farbe ausgewählt)
+def berechne_orbit(theta, p, abgebrochen):
+    """Läuft im Arbeiter-Thread des Klick-Verteilers: berechnet den
+    Orbit zu den Klick-Koordinaten, ohne selbst zu zeichnen."""
+    return orbit(theta, p)
+
+def zeichne_orbit(arrays):
+    """Zeichnet einen fertigen Orbit in einer zufälligen Farbe aus dem
+    farben-Array (muss im GUI-Thread aufgerufen werden)."""
     farben = ["#588C73", "#F2E394", "#F2AE72", "#D96459", "#8C4646"]
-    mode = plt.get_current_fig_manager().toolbar.mode
-    if mode == "":
-		# Abfrage, ob sich das Fenster im Zoommodus befindet. Falls
-		# nein, kann der neue Orbit gestartet werden.
-        theta, p = event.xdata, event.ydata     # Klick-Koordinaten
-        x_array, y_array = orbit(theta, p)
-        farbe = farben[randint(0,4)]            # zufällige Farbe
-        plt.plot(x_array, y_array, farbe, marker=".", linestyle="none",
-        markersize=1)                           # Plotbefehl
-        plt.draw()
+    x_array, y_array = arrays
+    farbe = farben[randint(0,4)]                # zufällige Farbe
+    plt.plot(x_array, y_array, farbe, marker=".", linestyle="none",
+    markersize=1)                               # Plotbefehl
 
 def main():
     """Mainfunktion. Initialisiert das Plotfenster und definiert, wie
     der Benutzer mit dem Fenster interagieren kann."""
     
-    plt.connect('button_press_event', onclick)  # Klickabfrage
-    plt.subplot(111, aspect=1.0)                # quadratisches Fenster
+    # Klickabfrage; die Orbits rechnen Arbeiter-Threads, gezeichnet
+    # wird im GUI-Thread
+    verteiler = klick_verteiler(plt.gcf(), berechne_orbit, zeichne_orbit)
+    ax = plt.subplot(111, aspect=1.0)           # quadratisches Fenster
     plt.title("Gekickter Rotor")
     plt.xlabel(r"$\theta$")
     plt.ylabel("$p$")
     plt.axis([0.0, 2*np.pi, -np.pi, np.pi])     # relevanter Ausschnitt
+    verfeinerung = verfeinerung_verbinden(ax)   # Zoom im Hintergrund füllen
     plt.show()
 
 if __name__ == "__main__":
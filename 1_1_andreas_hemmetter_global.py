@@ -2,6 +2,8 @@
 import numpy as np
 from matplotlib import pyplot as plt
 from random import randint
+from standardabbildung import positions_batch
+from ansicht import klick_verteiler
 
 """
 Dieses Programm plottet den Phasenraum eines gekickten Rotors mit
@@ -28,38 +30,29 @@ farben = ["#588C73", "#F2E394", "#F2AE72", "#D96459", "#8C4646"]
 
 #---Standardabbildung---
 
-def onclick(event):
-	"""Konvertiert Klickposition in neue Startwerte und schreibt (kart.)
-	Koordinaten für 1000 Iterationen in 2 Arrays. Bei jedem Klick wird
-	eine zufällige Farbe aus dem farben-Array asgewählt und der Plot
+def berechne(theta, p, abgebrochen):
+	"""Läuft im Arbeiter-Thread des Klick-Verteilers: schreibt (kart.)
+	Koordinaten für 1000 Iterationen ab der Klickposition in 2 Arrays
+	(nur Linksklicks ohne aktiven Zoom werden angenommen)."""
+	#Hauptteil, Iteration über 1000 Kicks (Startwert nicht mit
+	#ausgegeben) mit periodischen Randbed. für Winkel und Impuls
+	t, p = positions_batch(theta, p, len(kicks) + 1, K)
+	return t[1:, 0], p[1:, 0]
+
+def zeichne(arrays):
+	"""Zeichnet einen fertigen Orbit im GUI-Thread. Bei jedem Klick wird
+	eine zufällige Farbe aus dem farben-Array ausgewählt und der Plot
 	damit neugezeichnet (zusätzlich zu den alten)."""
-	mode = plt.get_current_fig_manager().toolbar.mode
-	if mode == "":
-		"""Abfrage, ob sich das Fenster im Zoommodus befindet. Falls
-		nein, kann der neue Orbit gestartet werden."""
-		x_array = [] #setzt Arrays zurück (somit sind immer nur
-		y_array = [] #1000 Einträge in jedem Array
-		
-		theta, p = event.xdata, event.ydata #Klick-Koord.
-		
-		for n in kicks:
-			"""Hauptteil, Iteration über 1000 Kicks. Winkel und Radius
-			werden laut Angabe berechnet (mit periodischen Randbed.
-			für Winkel und Radius) und anschließend in kart. Koord.
-			umgewandelt, in 2 Arrays gespeichert und geplottet."""
-			theta = (theta + p) % (2*np.pi)
-			p = (p + K * np.sin(theta) + np.pi) % (2*np.pi) - np.pi
-			x_array.append(theta)
-			y_array.append(p)
-		farbe = farben[randint(0,4)] #wählt zufällige Farbe aus
-		plt.plot(x_array, y_array, farbe, alpha=0.8, linewidth=0.2) #Plotbefehl
-		#leichte Transparenz, um dahinterliegende Orbits zu erkennen
-		plt.draw()
+	x_array, y_array = arrays
+	farbe = farben[randint(0,4)] #wählt zufällige Farbe aus
+	plt.plot(x_array, y_array, farbe, alpha=0.8, linewidth=0.2) #Plotbefehl
+	#leichte Transparenz, um dahinterliegende Orbits zu erkennen
 
 
 #---Plotbefehle---
 
-plt.connect('button_press_event', onclick) #Abfrage, ob geklickt wurde
+#Abfrage, ob geklickt wurde; die Orbits rechnen Arbeiter-Threads
+verteiler = klick_verteiler(plt.gcf(), berechne, zeichne)
 plt.subplot(111, aspect=1.0) #quadratisches Plotfenster
 plt.plot(x_array, y_array, farbe, alpha=0.8, linewidth=0.2) #eigentlicher Plot
 plt.title("Gekickter Rotor mit K = 2,6")
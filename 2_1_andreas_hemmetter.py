@@ -12,6 +12,7 @@ Andreas Hemmetter, 3957650"""
 
 import numpy as np                          # Importbefehle
 from matplotlib import pyplot as plt
+from ableitung import ableitungen, optimale_schrittweite
 
 def f(x):
     """Definition der Testfunktion"""
@@ -21,28 +22,17 @@ def f(x):
 def derivate(h, x):
     """Berechnet die Ableitung an der Stelle x auf 3 verschiedene
     Arten (vorwärts, zentral und extrapoliert) und analytisch.
-    Übernimmt eine Liste mit den verschiedenen Werten für die
-    Stützstellen und die Stelle x."""
+    Übernimmt ein Array mit den verschiedenen Werten für die
+    Stützstellen und die Stelle x. Alle h und Methoden werden auf
+    einmal ausgewertet, der analytische Wert nur einmal berechnet."""
     
-    a = []                                  # Listen für die Ableitungen
-    v = []
-    z = []
-    e = []
-    
-    for i in h:
-        
-        abl_a = (3*x**2) / (x**6 + 1)       # analytisch
-        a.append(abl_a)
-        
-        abl_v = (1/i) * (f(x+i) - f(x))     # vorwärtsdifferenziert
-        v.append(abl_v)
-        
-        abl_z = 1/i * (f(x+i/2)- f(x-i/2))  # zentral
-        z.append(abl_z)
-        
-        abl_e = 1/(3*i) * ((8*(f(x+i/4) - f(x-i/4))
-            - (f(x+i/2) - f(x-i/2))))       # extrapolierte Diff.
-        e.append(abl_e)
+    h = np.asarray(h)
+    a = np.full(h.shape, (3*x**2) / (x**6 + 1))      # analytisch
+    # gemeinsame Stützstellen (x +- h/2) werden nur einmal ausgewertet
+    abl = ableitungen(f, x, h)
+    v = abl["vorwaerts"]                    # vorwärtsdifferenziert
+    z = abl["zentral"]                      # zentral
+    e = abl["extrapoliert"]                 # extrapolierte Diff.
 
     return a, v, z, e
 
@@ -102,6 +92,14 @@ def main():
     a, v, z, e = derivate(h, x)
     v_err, z_err, e_err = rel_Fehler(h, v, a, z, e)
     v_h, z_h, e_h = skalierung(h)
+    # optimale Schrittweiten automatisch aus Abschneide- und
+    # Rundungsfehler geschätzt (statt aus dem Plot abgelesen)
+    optimal = {}
+    for methode in ("vorwaerts", "zentral", "extrapoliert"):
+        wert, fehler, h_opt = optimale_schrittweite(f, x, methode)
+        optimal[methode] = h_opt
+        print "%-12s | h_opt = %.1e | f' = %.15f +- %.1e" % (methode,
+            h_opt, wert, fehler)
     
     fig, ax = plt.subplots(figsize=(14,8))  # Größe des Plotfensters
     ax.plot(h, v_err, "#588C73", label=u"vorwärts")
@@ -110,6 +108,9 @@ def main():
     ax.plot(h, z_h, "#F2AE72", linestyle = "dashed", label="~$h^2$")
     ax.plot(h, e_err, "#8C4646", label="extrapoliert")
     ax.plot(h, e_h, "#8C4646", linestyle = "dashed", label="~$h^4$")
+    for methode, farbe in (("vorwaerts", "#588C73"),
+            ("zentral", "#F2AE72"), ("extrapoliert", "#8C4646")):
+        ax.axvline(optimal[methode], color=farbe, linestyle="dotted")
     ax.set_xscale("log")                    # logarithmische Skala
     ax.set_yscale("log")
     plt.xlabel("Schrittweite $h$")
@@ -139,9 +140,6 @@ if __name__ == "__main__":
 # anderen Methoden funktioniert dies analog, allerdings ergeben sich
 # hier O(h**2) und O(h**4).
 
-# Optimale Wahl von h:
-# Methode      |   h_min
-# --------------------------
-# vorwärts     | 8*10**(-2)
-# zentral      | 6*10**(-5)
-# extrapoliert | 5*10**(-8)
+# Optimale Wahl von h: wird in main() mit
+# ableitung.optimale_schrittweite bestimmt, ausgegeben und als
+# gepunktete Linie in den Plot eingezeichnet.
@@ -3,6 +3,7 @@
 from __future__ import division           # Garantiert Float division
 import numpy as np
 from matplotlib import pyplot as plt
+from ableitung import differenz, ableitungen
 
 """
 Dieses Programm bietet die Funktionen der numerischen Vorwaerts-,
@@ -15,34 +16,39 @@ def forward_difference(function, x, h):
     Diese Funktion uebernimmt eine Funktion als Parameter function und
     berechnet an der Stelle x die Ableitung mittels der Vorwaerts-
     differenz. (Achtung Quadratisches Argument)
+    x und h duerfen Arrays sein (siehe ableitung.differenz).
     """
-    return (1./h * (function((x+h)**2) - function((x)**2)))
+    return differenz(lambda u: function(u**2), x, h, "vorwaerts")
 
 def central_difference(function, x, h):
     """
     Diese Funktion uebernimmt eine Funktion als Parameter function und
     berechnet an der Stelle x die Ableitung mittels der Zentral-
     differenz. (Achtung Quadratisches Argument)
+    x und h duerfen Arrays sein (siehe ableitung.differenz).
     """
-    return (1./h * (function((x + h/2)**2) - function((x - h/2)**2)))
+    return differenz(lambda u: function(u**2), x, h, "zentral")
 
 def expol_difference(function, x, h):
     """
     Diese Funktion uebernimmt eine Funktion als Parameter function und
     berechnet an der Stelle x die Ableitung mittels der Zentral-
     differenz. (Achtung Quadratisches Argument)
+    x und h duerfen Arrays sein (siehe ableitung.differenz).
     """
-    return (1./(3*h) *(8 * (function((x + h/4)**2) - function((x - h/4)**2)) -
-           (function((x + h/2)**2) - function((x - h/2)**2))))
+    return differenz(lambda u: function(u**2), x, h, "extrapoliert")
 
 def main():
     # Berechnen der Numerischen Ableitung von np.arctan an der Stelle 
     # x = 1/3 mit den 3 gegebenen Funktionnen mit variablen Parameter h im
     # Intervall [10**(-10), 1]
     h = np.logspace(-10, 0, num=1001, endpoint=True)
-    forward = forward_difference(np.arctan, (1/3), h)
-    central = central_difference(np.arctan, (1/3), h)
-    expol   = expol_difference(np.arctan, (1/3), h)
+    # Alle drei Formeln teilen sich die Stuetzstellen (x +- h/2), daher
+    # werden sie gemeinsam mit einem Aufruf von np.arctan ausgewertet
+    abl = ableitungen(lambda u: np.arctan(u**2), (1/3), h)
+    forward = abl["vorwaerts"]
+    central = abl["zentral"]
+    expol   = abl["extrapoliert"]
     # Analytisch ermittelter Wert
     truevalue = 27./41
     # Berechnung des Relativen Fehlers
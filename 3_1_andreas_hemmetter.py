@@ -9,6 +9,7 @@ dieser numerischen Methoden an verschiedenen Funktionen begutachten."""
 
 import numpy as np
 from matplotlib import pyplot as plt
+from quadratur import adaptiv, konvergenzstudie
 
 def f1(x):
     """Funktion, von der das Integral berechnet werden soll."""
@@ -22,33 +23,22 @@ def f3(x):
     """Heaviside-Theta-Funktion"""
     return 0.5 * (1.0+np.sign(x))
 
-def integral(steps, N_array, a, b, f):
+def integral(steps, N_array, a, b, f, knicke=None):
     """Berechnet das bestimmte Integral der Funktion f von a nach b
     und benutzt Werte aus N_array als Stützstellenanzahl. Zur Berechnung
     werden Mittelpunktsregel, Trapezregel und Simpsonregel verwendet.
-    steps bestimmt die Größe der Arrays."""
+    steps bestimmt die Größe der Arrays. Mit knicke (Sprungstellen von
+    f, z.B. [0.0] für f3 oder quadratur.spruenge_suchen(f, a, b)) wird
+    an den Sprüngen geteilt, so dass die Regeln ihre Ordnung behalten."""
     
-    mitt = np.zeros(steps)                      # Arrays für die
-    trapz = np.zeros(steps)                     # Integrale
-    simps = np.zeros(steps)
+    # Alle drei Regeln und alle N werden aus einer gemeinsamen Auswertung
+    # von f berechnet: Stützstellenanzahlen, die sich ein Gitter teilen
+    # (z.B. N und 2N), werden zusammengefasst, und die Simpsonregel
+    # verwendet die Punkte von Trapez- und Mittelpunktsregel.
+    h, werte, anzahl = konvergenzstudie(f, a, b, N_array[:steps],
+        knicke=knicke)
     
-    for i in range(0, steps):
-        # Iteration läuft über die verschiedenen Stützpunktanzahlen. Für
-        # jedes i wird die x-Achse in dementsprechend viele Teilinter-
-        # valle aufgeteilt und das Integral damit angenähert.
-        x = np.linspace(a,b,N_array[i], endpoint=False)
-        h = (b-a)/N_array[i]
-        
-        mitt_array = f((2*x+h)/2.0)             # Mittelpunktsregel
-        mitt[i] = h * np.sum(mitt_array)
-        
-        trapz_array = ((f(x+h))+(f(x)))/2.0     # Trapezregel
-        trapz[i] = h * np.sum(trapz_array)
-        
-        simps_array = (1/6.0)*((f(x))+4.0*(f((2*x+h)/2.0))+f(x+h))
-        simps[i] = h * np.sum(simps_array)      # Simpsonregel
-        
-    return mitt, trapz, simps
+    return werte["mittelpunkt"], werte["trapez"], werte["simpson"]
 
 def rel_Fehler(steps, mitt, trapz, simps, exakt):
     """Berechnet die relativen Fehler der 3 numerischen Methoden.
@@ -86,6 +76,14 @@ def main():
     mitt_err, trapz_err, simps_err = rel_Fehler(steps, mitt, trapz, 
         simps, exakt)                           # Beträge der Fehler
     
+    # adaptive Integration: verfeinert nur dort, wo der lokale Fehler
+    # groß ist, statt N bis 10^5 durchzuprobieren
+    for methode in ("simpson", "kronrod"):
+        wert, fehler, anzahl = adaptiv(f1, a, b, 1e-12, methode)
+        print u"adaptiv (%s): I = %.15f, Fehlerschätzung %.1e, " \
+            u"%d Auswertungen, rel. Fehler %.1e" % (methode, wert,
+            fehler, anzahl, abs((wert - exakt)/exakt))
+    
     # Plotbefehle:
     fig, ax = plt.subplots(figsize=(14,8))
     ax.plot(((b-a)/N_array), mitt_err, "#588C73", label="Mittelpunkt",
@@ -138,3 +136,5 @@ if __name__ == "__main__":
 # entwicklung vorgenommen werden kann. Zu beachten ist, dass sich pro
 # Methode mehrere Linien zeigen (4 für Simpsonregel, 3 für Trapez- und
 # 2 für Mittelpunktsregel).
+# Mit integral(..., f3, knicke=[0.0]) wird an der Sprungstelle geteilt;
+# auf beiden Teilstücken ist f3 konstant und alle Regeln sind exakt.
@@ -3,6 +3,7 @@
 from __future__ import division
 import numpy as np
 from matplotlib import pyplot as plt
+from quadratur import adaptiv, romberg, konvergenzstudie
 
 
 def fkt(x):
@@ -61,17 +62,31 @@ def main():
     x1       = np.pi/3
     analytic = -1/4
 
-    # Integration ueber verschiedene Teilintervalle N [1, 10**5]
+    # Integration ueber verschiedene Teilintervalle N [1, 10**5]. Die
+    # Werte stimmen mit int_middle, int_trapez und int_simps ueberein;
+    # konvergenzstudie wertet die Funktion aber nur einmal pro Gitter aus
+    # und bildet alle drei Regeln aus denselben Stuetzstellen.
     N = np.unique(np.int32(np.logspace(0, 5, 1000, endpoint=True)))
-    # Array fuer Integralwerte
-    val_mid, val_trap, val_sim = np.zeros((3, len(N)))
-    # Array fuer Diskretisierungsparameter dx (Teilintervallbreite)
-    dx_mid, dx_trap, dx_sim = np.zeros((3, len(N)))
-    # Berechnung der Integrale fuer versch. Teilintervalle [1, 10**5]
-    for i in np.arange(0, len(N)):
-        val_mid[i], dx_mid[i] = int_middle(function, x0, x1, N[i])
-        val_trap[i], dx_trap[i] = int_trapez(function, x0, x1, N[i])
-        val_sim[i], dx_sim[i] = int_simps(function, x0, x1, N[i])
+    dx, werte, anzahl = konvergenzstudie(function, x0, x1, N)
+    val_mid, val_trap, val_sim = (werte["mittelpunkt"], werte["trapez"],
+                                  werte["simpson"])
+    # Diskretisierungsparameter dx (Teilintervallbreite)
+    dx_mid = dx_trap = dx_sim = dx
+    print("Konvergenzstudie mit " + str(anzahl) + " Funktionsauswertungen")
+
+    # Romberg-Extrapolation verschachtelter Trapezsummen (N = 1, 2, 4, ...)
+    wert, fehler, tabelle, anzahl = romberg(function, x0, x1, 20, 1e-14)
+    print("Romberg: I = " + str(wert) + "   Fehlerschaetzung = " +
+    str(fehler) + "   Auswertungen = " + str(anzahl))
+
+    # Adaptive Integration zum Vergleich: verfeinert nur, wo der lokale
+    # Fehler gross ist, und liefert eine Fehlerschaetzung mit
+    for methode in ("simpson", "kronrod"):
+        wert, fehler, anzahl = adaptiv(function, x0, x1, 1e-12, methode)
+        print("Adaptiv (" + methode + "): I = " + str(wert) +
+        "   Fehlerschaetzung = " + str(fehler) + "   Auswertungen = " +
+        str(anzahl) + "   rel. Fehler = " +
+        str(np.abs((analytic - wert)/analytic)))
 
     # Plot anlegen und konfigurieren
     plt.subplot(111, xscale="log", yscale="log")
@@ -127,3 +142,6 @@ if __name__ == "__main__":
 #       relativen Fehlers von unter 10**-12 auftreten. Diese sind vermutlich
 #       zufaellige Werte bei denen eine Stuetzstelle guenstig auf die
 #       Unstetigkeit bei x=0 faellt
+#       Wird das Intervall an der Sprungstelle geteilt (bekannt oder mit
+#       quadratur.spruenge_suchen gefunden, siehe quadratur.stueckweise),
+#       sind alle Regeln auf den konstanten Teilstuecken exakt.
@@ -13,6 +13,7 @@ import functools                            # Importbefehle
 import numpy as np
 from matplotlib import pyplot as plt
 from scipy.integrate import odeint          # Paket zum Lösen der DGL
+from jacobi import dfun
 
 def abl(y, t, A = 0.1, B = 0.1, omega = 1.0):
     """Rechte Seite der Bewegungsgleichung des Teilchens.
@@ -61,8 +62,10 @@ def onclick(event, abl, t, A, B, omega, traj, strob, punkte):
         y = event.ydata
         # Eigentliche Lösung der DGL: übergeben werden die rechte Seite
         # der Funktion (abl), der Anfangswertvektor [x,y], das Zeiten-
-        # Array t, sowie die Parameter A, B und omega.
-        y_t = odeint(abl, [x, y], t, args=(A, B, omega))
+        # Array t, sowie die Parameter A, B und omega. Die Jacobi-Matrix
+        # von abl wird per komplexem Schritt bereitgestellt.
+        y_t = odeint(abl, [x, y], t, args=(A, B, omega),
+            Dfun=dfun(abl, "komplex", vektorisiert=True))
         stroboskop(y_t, punkte, strob)      # Zeichnen der Trajektorien
         trajektorie(y_t, traj)
 
@@ -22,6 +22,7 @@ from __future__ import division
 import numpy as np
 from scipy.integrate import odeint
 from matplotlib import pyplot as plt
+from jacobi import dfun
 
 def rechteSeite(y, t, A=0.1, B=0.1, omega=1):
     """
@@ -32,6 +33,11 @@ def rechteSeite(y, t, A=0.1, B=0.1, omega=1):
     """
     return np.array([y[1], -4 * y[0]**3 + 2*y[0] - A - B * np.sin(omega * t)])
 
+# Jacobi-Matrix der rechten Seite fuer odeint (komplexer Schritt, alle
+# Spalten in einem Aufruf, da rechteSeite elementweise rechnet; sonst
+# bildet odeint sie selbst mit einem Aufruf pro Spalte)
+jacobi_rechteSeite = dfun(rechteSeite, "komplex", vektorisiert=True)
+
 
 def mouse_click(event, A=0.1, B=0.1, omega=1):
     """
@@ -45,7 +51,8 @@ def mouse_click(event, A=0.1, B=0.1, omega=1):
     # Prueft ob Zoom deaktiviert ist und ob mit links geklickt wird
     if event.button == 1 and event.inaxes and mode == '':
         y_t = odeint(rechteSeite, [event.xdata,event.ydata],
-        t, args=(A,B,omega))                    # Berechnung der Koordinaten
+        t, args=(A,B,omega),
+        Dfun=jacobi_rechteSeite)                # Berechnung der Koordinaten
         x_t= y_t[:, 0]                          # x-Koordinaten
         p_t= y_t[:, 1]                          # y-Koordinaten
         ax_traject.plot(x_t, p_t,)              # Kontinuierlicher Plot
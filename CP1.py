@@ -6,27 +6,26 @@ Created on Tue Apr 14 21:20:19 2015
 @author: David
 """
 
+import functools
 import numpy as np
 from matplotlib import pyplot as plt
+from standardabbildung import positions_batch
+from ansicht import klick_verteiler
 
 
 def modp(p):
     return (p+np.pi) % (2*np.pi)-np.pi
 
-def Iteration(t0, p0, n=1000):
-    for i in np.arange(0,n):
-        if i==0:
-            t=[t0]
-            p=[p0]
-        t.append((t[-1]+p[-1]) % (2*np.pi))
-        p.append(modp(p[-1]+K*np.sin(t[-1])))
-    return t,p
-
-def MouseClick(event):
-    if plt.get_current_fig_manager().toolbar.mode=="":
-            x, y=Iteration(event.xdata, event.ydata)
-            plt.plot(x, y)
-            plt.draw()
+def Iteration(t0, p0, n=1000, K=0.5):
+    t, p = positions_batch(t0, p0, n+1, K)
+    return t[:, 0], p[:, 0]
+
+def Berechnen(x, y, abgebrochen, K=0.5):
+    return Iteration(x, y, K=K)
+
+def Zeichnen(orbit):
+    x, y = orbit
+    plt.plot(x, y)
 
 if __name__=="__main__":
     K=0.5
@@ -41,5 +40,6 @@ if __name__=="__main__":
                r"$3/2\pi$", r"$2\pi$"))
     plt.yticks(np.arange(-np.pi,np.pi+0.1,np.pi/2),(r"-$\pi$", r"-$\pi/2$",
                r"$0$",r"$\pi/2$", r"$\pi$"))               
-    plt.connect('button_press_event', MouseClick)
+    verteiler = klick_verteiler(plt.gcf(), functools.partial(Berechnen, K=K),
+                                Zeichnen)
     plt.show()
@@ -0,0 +1,143 @@
+"""Flaechentreue Abbildungen als austauschbare Kerne fuer die Iteratoren.
+
+Jede Abbildung ist ein Schritt schritt(x, y, par, puffer), der die Arrays
+x und y in-place um eine Iteration weiterschiebt; puffer ist ein Hilfsarray
+gleicher Laenge und par der (Skalar-, Array- oder Tupel-)Parameter. Damit
+laufen alle Abbildungen durch dieselben Iteratoren positions_batch und
+positions_chunks aus standardabbildung.py und teilen sich die
+Dichte-Akkumulation. Eine neue Abbildung braucht nur einen Schritt und
+einen Eintrag in ABBILDUNGEN.
+"""
+
+import numpy as np
+
+from standardabbildung import (ZWEIPI, kick, positions_batch,
+                               positions_chunks, dichte_anlegen,
+                               dichte_hinzufuegen, startgitter)
+
+
+def henon(x, y, alpha, puffer):
+    """Flaechentreue Henon-Abbildung (Drehung um alpha nach Scherung).
+
+        x' = x cos(alpha) - (y - x^2) sin(alpha)
+        y' = x sin(alpha) + (y - x^2) cos(alpha)
+
+    Orbits ausserhalb des Stabilitaetsgebiets laufen gegen unendlich.
+    """
+    s, c = np.sin(alpha), np.cos(alpha)
+    np.multiply(x, x, out=puffer)                     # puffer = y - x^2
+    np.subtract(y, puffer, out=puffer)
+    np.multiply(x, s, out=y)                          # y' = x s + puffer c
+    x *= c                                            # x' = x c - puffer s
+    x -= puffer*s
+    y += puffer*c
+
+
+def nontwist(x, y, par, puffer):
+    """Standard-Nontwist-Abbildung mit par = (a, b).
+
+        y' = y - b sin(2 pi x)
+        x' = x + a (1 - y'^2)   (mod 1)
+    """
+    a, b = par
+    np.multiply(x, ZWEIPI, out=puffer)
+    np.sin(puffer, out=puffer)
+    puffer *= b
+    y -= puffer
+    np.multiply(y, y, out=puffer)
+    np.subtract(1.0, puffer, out=puffer)
+    puffer *= a
+    x += puffer
+    np.remainder(x, 1.0, out=x)
+
+
+def harper(x, y, par, puffer):
+    """Harper-Abbildung mit par = (a, b) auf dem Torus.
+
+        p'     = p - a sin(theta)      (mod 2pi, auf [-pi, pi))
+        theta' = theta + b sin(p')     (mod 2pi)
+    """
+    a, b = par
+    np.sin(x, out=puffer)
+    puffer *= a
+    y -= puffer
+    y += np.pi
+    np.remainder(y, ZWEIPI, out=y)
+    y -= np.pi
+    np.sin(y, out=puffer)
+    puffer *= b
+    x += puffer
+    np.remainder(x, ZWEIPI, out=x)
+
+
+# Verzeichnis der Abbildungen: Schritt, Default-Parameter und
+# Darstellungsbereich (x_min, x_max, y_min, y_max)
+ABBILDUNGEN = {
+    "standard": {"schritt": kick, "parameter": 2.6,
+                 "bereich": (0.0, ZWEIPI, -np.pi, np.pi)},
+    "henon": {"schritt": henon, "parameter": np.arccos(0.24),
+              "bereich": (-1.0, 1.0, -1.0, 1.0)},
+    "nontwist": {"schritt": nontwist, "parameter": (0.615, 0.4),
+                 "bereich": (0.0, 1.0, -1.5, 1.5)},
+    "harper": {"schritt": harper, "parameter": (1.0, 1.0),
+               "bereich": (0.0, ZWEIPI, -np.pi, np.pi)},
+}
+
+
+def iteriere(name, x0, y0, n=1000, par=None):
+    """Berechne n Punkte einer Abbildung fuer M Startwerte gleichzeitig.
+
+    Parameter:
+        name: Schluessel in ABBILDUNGEN
+        x0, y0: Startwerte (Skalare oder Arrays der Laenge M)
+        n: Anzahl der Punkte pro Orbit (inklusive Startwert)
+        par: Parameter der Abbildung (Default aus ABBILDUNGEN)
+    Rueckgabe:
+        x, y: Arrays der Groesse (n, M)
+    """
+    abbildung = ABBILDUNGEN[name]
+    if par is None:
+        par = abbildung["parameter"]
+    return positions_batch(x0, y0, n, par, schritt=abbildung["schritt"])
+
+
+def iteriere_chunks(name, x0, y0, n=1000, par=None, chunk=1000):
+    """Blockweise Iteration einer Abbildung wie positions_chunks.
+
+    Parameter:
+        name, x0, y0, n, par: wie bei iteriere (n=None: unbegrenzt)
+        chunk: maximale Anzahl Zeilen pro Block
+    Rueckgabe:
+        Generator ueber Bloecke (x, y) der Groesse (<= chunk, M)
+    """
+    abbildung = ABBILDUNGEN[name]
+    if par is None:
+        par = abbildung["parameter"]
+    return positions_chunks(x0, y0, n, par, chunk,
+                            schritt=abbildung["schritt"])
+
+
+def portrait(name, par=None, stufe=6, kicks=1000, nbins=512, H=None,
+             bereich=None):
+    """Phasenraumdichte einer Abbildung fuer ein Gitter von Startwerten.
+
+    Parameter:
+        name: Schluessel in ABBILDUNGEN
+        par: Parameter der Abbildung (Default aus ABBILDUNGEN)
+        stufe: 4^stufe Startwerte, gleichmaessig im Bereich verteilt
+        kicks: Punkte pro Orbit
+        nbins: Aufloesung des Histogramms (wenn H nicht uebergeben wird)
+        H: vorhandenes Histogramm, zu dem addiert wird
+        bereich: Ausschnitt (Default: Darstellungsbereich der Abbildung)
+    Rueckgabe:
+        H: Histogramm wie bei dichte_anlegen, bezogen auf bereich
+    """
+    if bereich is None:
+        bereich = ABBILDUNGEN[name]["bereich"]
+    if H is None:
+        H = dichte_anlegen(nbins)
+    x0, y0 = startgitter(bereich, stufe)
+    with np.errstate(over='ignore', invalid='ignore'):    # Henon: Flucht
+        for x, y in iteriere_chunks(name, x0, y0, kicks, par, chunk=256):
+            dichte_hinzufuegen(H, x, y, bereich=bereich)
+    return H
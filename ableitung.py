@@ -0,0 +1,367 @@
+"""Numerische Ableitungen mit Differenzenformeln und Richardson-Extrapolation.
+
+Alle Funktionen broadcasten ueber Arrays von Auswertestellen x und
+Schrittweiten h: Fuer jedes Paar (x, h) werden die Stuetzstellen der
+Differenzenformel gebildet und die Funktion f mit einem einzigen
+vektorisierten Aufruf auf allen Stuetzstellen ausgewertet. Die Formeln
+folgen der Konvention der Uebungen (Zentraldifferenz mit x +- h/2).
+Werden mehrere Formeln oder Schrittweiten gleichzeitig benoetigt, sammelt
+ableitungen() alle Stuetzstellen und wertet jede nur einmal aus.
+
+Fuer analytische Funktionen gibt es zusaetzlich zwei Verfahren ohne
+Differenzen und damit ohne Ausloeschung: den komplexen Schritt
+(komplexschritt) und die Vorwaerts-Ableitung mit Dualzahlen (Dual).
+ableitungsfunktion() verpackt jedes Verfahren als Ableitungsfunktion mit
+der Signatur der Funktion, etwa als fprime fuer scipy.optimize.newton.
+"""
+
+import numpy as np
+
+
+# Differenzenformeln: Stuetzstellen (Vielfache von h), Gewichte (Ergebnis
+# wird durch h geteilt), fuehrende Fehlerordnung und Ordnungszuwachs pro
+# Richardson-Schritt
+STENCILS = {
+    "vorwaerts": {"stellen": (0.0, 1.0), "gewichte": (-1.0, 1.0),
+                  "ordnung": 1, "zuwachs": 1},
+    "zentral": {"stellen": (-0.5, 0.5), "gewichte": (-1.0, 1.0),
+                "ordnung": 2, "zuwachs": 2},
+    "extrapoliert": {"stellen": (-0.5, -0.25, 0.25, 0.5),
+                     "gewichte": (1/3.0, -8/3.0, 8/3.0, -1/3.0),
+                     "ordnung": 4, "zuwachs": 2},
+}
+
+
+def stuetzwerte(f, punkte):
+    """Werte f auf allen Stuetzstellen aus, jede verschiedene nur einmal.
+
+    Parameter:
+        f: vektorisierte Funktion
+        punkte: Array beliebiger Form mit den Stuetzstellen
+    Rueckgabe:
+        werte: f(punkte), berechnet mit einem Aufruf von f auf den
+            eindeutigen Stellen
+    """
+    punkte = np.asarray(punkte)
+    eindeutig, index = np.unique(punkte, return_inverse=True)
+    return np.asarray(f(eindeutig))[index].reshape(punkte.shape)
+
+
+def differenz(f, x, h, methode="zentral", eindeutig=False):
+    """Ableitung von f mit einer Differenzenformel fuer viele (x, h).
+
+    Parameter:
+        f: vektorisierte Funktion (akzeptiert beliebig geformte Arrays)
+        x: Auswertestellen (Skalar oder Array)
+        h: Schrittweiten (Skalar oder Array, broadcastbar mit x)
+        methode: Schluessel in STENCILS
+        eindeutig: doppelte Stuetzstellen nur einmal auswerten (lohnt fuer
+            teure f oder sich ueberlappende Schrittweiten)
+    Rueckgabe:
+        Array der gebroadcasteten Form von x und h mit den Ableitungen
+    """
+    stencil = STENCILS[methode]
+    x, h = np.broadcast_arrays(np.asarray(x, float), np.asarray(h, float))
+    stellen = np.asarray(stencil["stellen"])
+    gewichte = np.asarray(stencil["gewichte"])
+    punkte = x[..., np.newaxis] + stellen*h[..., np.newaxis]
+    if eindeutig:
+        werte = stuetzwerte(f, punkte)
+    else:
+        werte = f(punkte)                             # ein Aufruf
+    return werte.dot(gewichte)/h
+
+
+def ableitungen(f, x, h, methoden=("vorwaerts", "zentral", "extrapoliert")):
+    """Mehrere Differenzenformeln mit gemeinsam genutzten Stuetzstellen.
+
+    Die Stuetzstellen aller Formeln werden vereinigt (x +- h/2 etwa teilen
+    sich Zentral- und extrapolierte Differenz) und zusammen mit allen
+    Schrittweiten in einem Aufruf von f ausgewertet; jede Stelle, die
+    mehrfach vorkommt, wird nur einmal berechnet.
+
+    Parameter:
+        f: vektorisierte Funktion
+        x, h: Auswertestellen und Schrittweiten (broadcastbar)
+        methoden: Schluessel in STENCILS
+    Rueckgabe:
+        Dictionary methode -> Array der gebroadcasteten Form von x und h
+    """
+    x, h = np.broadcast_arrays(np.asarray(x, float), np.asarray(h, float))
+    stellen = sorted(set(s for methode in methoden
+                         for s in STENCILS[methode]["stellen"]))
+    punkte = x[..., np.newaxis] + np.asarray(stellen)*h[..., np.newaxis]
+    werte = stuetzwerte(f, punkte)
+
+    ergebnis = {}
+    for methode in methoden:
+        stencil = STENCILS[methode]
+        spalten = [stellen.index(s) for s in stencil["stellen"]]
+        ergebnis[methode] = (werte[..., spalten].dot(stencil["gewichte"])
+                             / h)
+    return ergebnis
+
+
+def richardson(f, x, h, stufen=3, methode="zentral", faktor=2.0):
+    """Richardson-Extrapolation einer Differenzenformel bis zu hoher Ordnung.
+
+    Die Formel wird fuer h, h/faktor, ..., h/faktor**stufen ausgewertet
+    (alle Stuetzstellen in einem Aufruf von f, gemeinsame Stellen der
+    Zeilen nur einmal) und in einem Neville-artigen Tableau extrapoliert.
+    Jede Spalte hebt die Fehlerordnung um den Zuwachs der Formel (2 fuer
+    die Zentraldifferenz), die Diagonale hat also die Ordnung
+    ordnung + stufen*zuwachs.
+
+    Parameter:
+        f: vektorisierte Funktion
+        x, h: Auswertestellen und Start-Schrittweiten (broadcastbar)
+        stufen: Anzahl der Extrapolationsschritte
+        methode: Schluessel in STENCILS
+        faktor: Verkleinerungsfaktor der Schrittweite pro Zeile
+    Rueckgabe:
+        wert: extrapolierte Ableitung (Form von x und h)
+        fehler: Fehlerschaetzung |T[m, m] - T[m, m-1]|
+        tabelle: Array der Groesse (stufen+1, stufen+1, ...) mit T[i, j]
+            fuer i >= j (uebrige Eintraege NaN)
+    """
+    stencil = STENCILS[methode]
+    x, h = np.broadcast_arrays(np.asarray(x, float), np.asarray(h, float))
+    hs = h[np.newaxis, ...]/faktor**np.arange(stufen + 1).reshape(
+        (-1,) + (1,)*h.ndim)                          # (stufen+1, ...)
+    erste = differenz(f, x[np.newaxis, ...], hs, methode,
+                      eindeutig=True)
+
+    tabelle = np.full((stufen + 1,) + erste.shape, np.nan)
+    tabelle[:, 0] = erste
+    for j in range(1, stufen + 1):
+        nenner = faktor**(stencil["ordnung"]
+                          + (j - 1)*stencil["zuwachs"]) - 1.0
+        tabelle[j:, j] = (tabelle[j:, j - 1]
+                          + (tabelle[j:, j - 1] - tabelle[j - 1:-1, j - 1])
+                          / nenner)
+    wert = tabelle[stufen, stufen]
+    if stufen > 0:
+        fehler = np.abs(wert - tabelle[stufen, stufen - 1])
+    else:
+        fehler = np.full(wert.shape, np.nan)
+    return wert, fehler, tabelle
+
+
+def optimale_schrittweite(f, x, methode="zentral", h0=1.0, stufen=16,
+                          faktor=4.0):
+    """Ableitung bei der Schrittweite mit dem kleinsten geschaetzten Fehler.
+
+    Die Formel wird auf der kurzen Folge h_k = h0*max(1, |x|)/faktor**k
+    ausgewertet. Der Abschneidefehler bei h_k wird aus dem Unterschied zur
+    naechstkleineren Schrittweite geschaetzt,
+
+        |D(h_k) - D(h_k+1)| / (1 - faktor**-ordnung),
+
+    der Rundungsfehler aus der Maschinengenauigkeit, der Groesse der
+    Funktionswerte und den Gewichten der Formel, eps*sum|w|*max|f|/h_k.
+    Gewaehlt wird fuer jedes x das h_k mit der kleinsten Summe; das
+    ersetzt das Ablesen des Minimums aus einem Fehlerplot.
+
+    Parameter:
+        f: vektorisierte Funktion
+        x: Auswertestellen (Skalar oder Array)
+        methode: Schluessel in STENCILS
+        h0: groesste Probe-Schrittweite (relativ zu max(1, |x|))
+        stufen: Anzahl der Verkleinerungen
+        faktor: Verkleinerungsfaktor zwischen zwei Proben
+    Rueckgabe:
+        wert: Ableitung bei der gewaehlten Schrittweite (Form von x)
+        fehler: geschaetzter Gesamtfehler (Abschneide- plus Rundungsfehler)
+        h: gewaehlte Schrittweite
+    """
+    stencil = STENCILS[methode]
+    x = np.asarray(x, float)
+    skala = h0*np.maximum(1.0, np.abs(x))
+    hs = skala[np.newaxis, ...]/faktor**np.arange(stufen + 1).reshape(
+        (-1,) + (1,)*x.ndim)                          # (stufen+1, ...)
+    stellen = np.asarray(stencil["stellen"])
+    punkte = x[np.newaxis, ..., np.newaxis] + stellen*hs[..., np.newaxis]
+    werte = stuetzwerte(f, punkte)                    # ein Aufruf
+    D = werte.dot(stencil["gewichte"])/hs
+
+    abschneide = (np.abs(D[:-1] - D[1:])
+                  / (1.0 - faktor**-float(stencil["ordnung"])))
+    rundung = (np.finfo(float).eps*np.sum(np.abs(stencil["gewichte"]))
+               * np.max(np.abs(werte[:-1]), axis=-1)/hs[:-1])
+    gesamt = abschneide + rundung
+    beste = np.argmin(gesamt, axis=0)[np.newaxis, ...]
+
+    wert = np.take_along_axis(D[:-1], beste, axis=0)[0]
+    fehler = np.take_along_axis(gesamt, beste, axis=0)[0]
+    h = np.take_along_axis(hs[:-1], beste, axis=0)[0]
+    return wert, fehler, h
+
+
+def komplexschritt(f, x, h=1e-20, args=()):
+    """Ableitung einer analytischen Funktion mit komplexem Schritt.
+
+    f'(x) = Im f(x + ih)/h + O(h^2). Da keine Differenz gebildet wird,
+    gibt es keine Ausloeschung und h kann beliebig klein gewaehlt werden;
+    das Ergebnis ist auf Maschinengenauigkeit genau. f muss fuer komplexe
+    Argumente analytisch fortgesetzt sein (kein abs, kein np.real, ...).
+
+    Parameter:
+        f: vektorisierte Funktion f(x, *args)
+        x: Auswertestellen (Skalar oder Array)
+        h: Schrittweite in imaginaerer Richtung
+        args: weitere Argumente fuer f
+    Rueckgabe:
+        Array der Form von x mit den Ableitungen
+    """
+    x = np.asarray(x, float)
+    return np.imag(f(x + 1j*h, *args))/h
+
+
+class Dual(object):
+    """Dualzahl wert + abl*epsilon mit epsilon^2 = 0.
+
+    Rechnet man eine Funktion mit Dual(x, 1) statt x, enthaelt abl des
+    Ergebnisses die exakte Ableitung (Vorwaerts-Modus der automatischen
+    Differentiation). wert und abl sind Arrays; die Rechenoperatoren und
+    die NumPy-Ufuncs aus _DUAL_REGELN (np.sin, np.exp, np.arctan, ...)
+    arbeiten elementweise auf ihnen.
+    """
+
+    def __init__(self, wert, abl=0.0):
+        self.wert = np.asarray(wert, float)
+        self.abl = np.asarray(abl, float)
+
+    def __repr__(self):
+        return "Dual(%r, %r)" % (self.wert, self.abl)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        regel = _DUAL_REGELN.get(ufunc)
+        if method != "__call__" or kwargs or regel is None:
+            return NotImplemented
+        return regel(*[a if isinstance(a, Dual) else Dual(a)
+                       for a in inputs])
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    __div__ = __truediv__                             # Python 2
+    __rdiv__ = __rtruediv__
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+
+def _dual_potenz(a, b):
+    """Ableitungsregel fuer a**b (konstanter Exponent ohne log(a))."""
+    wert = a.wert**b.wert
+    if not np.any(b.abl):
+        return Dual(wert, b.wert*a.wert**(b.wert - 1)*a.abl)
+    return Dual(wert, wert*(b.abl*np.log(a.wert) + b.wert*a.abl/a.wert))
+
+
+def _dual_kette(funktion, ableitung):
+    """Kettenregel fuer eine elementweise Funktion mit Ableitung."""
+    return lambda a: Dual(funktion(a.wert), ableitung(a.wert)*a.abl)
+
+
+# Rechenregeln der Dualzahlen fuer die unterstuetzten Ufuncs
+_DUAL_REGELN = {
+    np.add: lambda a, b: Dual(a.wert + b.wert, a.abl + b.abl),
+    np.subtract: lambda a, b: Dual(a.wert - b.wert, a.abl - b.abl),
+    np.multiply: lambda a, b: Dual(a.wert*b.wert,
+                                   a.abl*b.wert + a.wert*b.abl),
+    np.true_divide: lambda a, b: Dual(a.wert/b.wert,
+                                      (a.abl*b.wert - a.wert*b.abl)
+                                      / b.wert**2),
+    np.power: _dual_potenz,
+    np.negative: lambda a: Dual(-a.wert, -a.abl),
+    np.square: lambda a: Dual(a.wert**2, 2*a.wert*a.abl),
+    np.sqrt: _dual_kette(np.sqrt, lambda x: 0.5/np.sqrt(x)),
+    np.exp: _dual_kette(np.exp, np.exp),
+    np.log: _dual_kette(np.log, lambda x: 1.0/x),
+    np.sin: _dual_kette(np.sin, np.cos),
+    np.cos: _dual_kette(np.cos, lambda x: -np.sin(x)),
+    np.tan: _dual_kette(np.tan, lambda x: 1.0/np.cos(x)**2),
+    np.arcsin: _dual_kette(np.arcsin, lambda x: 1.0/np.sqrt(1 - x**2)),
+    np.arccos: _dual_kette(np.arccos, lambda x: -1.0/np.sqrt(1 - x**2)),
+    np.arctan: _dual_kette(np.arctan, lambda x: 1.0/(1 + x**2)),
+    np.sinh: _dual_kette(np.sinh, np.cosh),
+    np.cosh: _dual_kette(np.cosh, np.sinh),
+    np.tanh: _dual_kette(np.tanh, lambda x: 1.0/np.cosh(x)**2),
+    np.absolute: _dual_kette(np.absolute, np.sign),
+}
+
+
+def dual(f, x, args=()):
+    """Exakte Ableitung von f mit Dualzahlen (Vorwaerts-Modus).
+
+    Parameter:
+        f: Funktion f(x, *args) aus Rechenoperatoren und den Ufuncs in
+            _DUAL_REGELN (mit np.sin usw., nicht math.sin)
+        x: Auswertestellen (Skalar oder Array)
+        args: weitere Argumente fuer f (werden nicht abgeleitet)
+    Rueckgabe:
+        Array der Form von x mit den Ableitungen
+    """
+    x = np.asarray(x, float)
+    y = f(Dual(x, np.ones_like(x)), *args)
+    if not isinstance(y, Dual):                       # f haengt nicht von x ab
+        return np.zeros_like(x)
+    return np.broadcast_to(y.abl, np.broadcast(x, y.wert).shape).copy()
+
+
+def ableitungsfunktion(f, methode="komplex", **optionen):
+    """Ableitungsfunktion nach dem ersten Argument von f.
+
+    Die zurueckgegebene Funktion hat dieselbe Signatur wie f und laesst
+    sich daher direkt als Ableitung an Newton-Verfahren oder ODE-Loeser
+    uebergeben, z.B. opt.newton(f, x0, ableitungsfunktion(f), args=...).
+
+    Parameter:
+        f: vektorisierte Funktion f(x, *args)
+        methode: "komplex", "dual" oder ein Schluessel in STENCILS (dann
+            mit automatisch gewaehlter Schrittweite)
+        optionen: weitere Parameter des Verfahrens (h, stufen, ...)
+    Rueckgabe:
+        Funktion fprime(x, *args)
+    """
+    if methode == "komplex":
+        return lambda x, *args: komplexschritt(f, x, args=args, **optionen)
+    if methode == "dual":
+        return lambda x, *args: dual(f, x, args=args)
+    STENCILS[methode]                                 # KeyError, falls falsch
+
+    def fprime(x, *args):
+        return optimale_schrittweite(lambda u: f(u, *args), x, methode,
+                                     **optionen)[0]
+    return fprime
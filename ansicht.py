@@ -0,0 +1,224 @@
+"""Interaktive Hilfsfunktionen fuer die Phasenraum-Viewer des Rotors.
+
+Rechenintensive Arbeit (Zoom-Verfeinerung, Orbits zu Mausklicks) laeuft
+in Hintergrund-Threads; die Ergebnisse werden ueber eine Queue an einen
+Matplotlib-Timer im GUI-Thread uebergeben, da Matplotlib selbst nicht
+threadsicher ist.
+"""
+
+import collections
+import threading
+import traceback
+
+try:
+    import queue                  # Python 3
+except ImportError:
+    import Queue as queue         # Python 2
+
+from standardabbildung import (positions_chunks, dichte_anlegen,
+                               dichte_hinzufuegen, dichte_zeichnen,
+                               dichte_aktualisieren, startgitter)
+
+
+def _verfeinern(zustand, generation, bereich):
+    """Hintergrund-Thread: Ausschnitt von grob nach fein auffuellen.
+
+    Nach jeder Stufe wird eine Kopie des Ausschnitt-Histogramms in die
+    Queue gelegt. Der Thread bricht ab, sobald ein neuerer Ausschnitt
+    angefordert wurde.
+    """
+    H = dichte_anlegen(zustand["nbins"])
+    for stufe in range(zustand["stufen"]):
+        theta0, p0 = startgitter(bereich, stufe)
+        for start in range(0, len(theta0), zustand["paket"]):
+            sl = slice(start, start + zustand["paket"])
+            for t, p in positions_chunks(theta0[sl], p0[sl],
+                                         zustand["kicks"], zustand["K"],
+                                         chunk=256):
+                if zustand["generation"] != generation:
+                    return                            # veralteter Auftrag
+                dichte_hinzufuegen(H, t, p, bereich=bereich)
+        zustand["queue"].put((generation, H.copy(), bereich))
+
+
+def _abholen(zustand, ax):
+    """Timer im GUI-Thread: Auftraege starten und Ergebnisse zeichnen."""
+    if zustand["geaendert"]:
+        zustand["geaendert"] = False
+        tmin, tmax = sorted(ax.get_xlim())
+        pmin, pmax = sorted(ax.get_ylim())
+        bereich = (tmin, tmax, pmin, pmax)
+        if bereich != zustand["bereich"]:
+            zustand["bereich"] = bereich
+            zustand["generation"] += 1
+            faden = threading.Thread(target=_verfeinern,
+                                     args=(zustand, zustand["generation"],
+                                           bereich))
+            faden.daemon = True
+            faden.start()
+
+    neu = None
+    while True:                                       # nur das neueste Bild
+        try:
+            neu = zustand["queue"].get_nowait()
+        except queue.Empty:
+            break
+    if neu is not None and neu[0] == zustand["generation"]:
+        _, H, bereich = neu
+        if zustand["bild"] is None:
+            zustand["bild"] = dichte_zeichnen(ax, H, cmap=zustand["cmap"],
+                                              bereich=bereich)
+            zustand["bild"].set_alpha(0.7)            # Klick-Orbits sichtbar
+        else:
+            dichte_aktualisieren(zustand["bild"], H, bereich)
+        ax.figure.canvas.draw_idle()
+
+
+def verfeinerung_verbinden(ax, K=2.6, nbins=400, kicks=1000, stufen=7,
+                           paket=1024, intervall=100, cmap='Blues'):
+    """Fuelle den sichtbaren Ausschnitt nach jedem Zoom mit neuen Orbits.
+
+    Aendern sich die Achsengrenzen, werden im neuen Ausschnitt Startwerte
+    von grob nach fein (Stufe k: 4^k Startwerte) gesetzt, in einem
+    Hintergrund-Thread iteriert und als eigenes Bild ueber dem Ausschnitt
+    dargestellt. Die Oberflaeche bleibt dabei bedienbar; ein erneuter Zoom
+    verwirft die noch laufende Berechnung.
+
+    Parameter:
+        ax: Matplotlib-Achsen des Phasenraumdiagramms
+        K: Kickstaerke
+        nbins: Aufloesung des Ausschnitt-Histogramms
+        kicks: Punkte pro Orbit
+        stufen: Anzahl der Verfeinerungsstufen
+        paket: Startwerte, die gemeinsam iteriert werden
+        intervall: Abfrageintervall des GUI-Timers in ms
+        cmap: Farbtabelle des Ausschnittbildes
+    Rueckgabe:
+        zustand: Dictionary mit Timer, Queue und Bild (Referenz halten,
+            sonst beendet die Garbage Collection den Timer)
+    """
+    ax.set_autoscale_on(False)                        # set_extent darf die
+                                                      # Grenzen nicht aendern
+    zustand = {"K": K, "nbins": nbins, "kicks": kicks, "stufen": stufen,
+               "paket": paket, "cmap": cmap, "queue": queue.Queue(),
+               "generation": 0, "bereich": None, "bild": None,
+               "geaendert": False}
+
+    def geaendert(ax):
+        """Neuen Ausschnitt merken; der Start folgt entprellt im Timer."""
+        zustand["geaendert"] = True
+    ax.callbacks.connect('xlim_changed', geaendert)
+    ax.callbacks.connect('ylim_changed', geaendert)
+
+    timer = ax.figure.canvas.new_timer(interval=intervall)
+    timer.add_callback(_abholen, zustand, ax)
+    timer.start()
+    zustand["timer"] = timer
+    return zustand
+
+
+def _arbeiter(zustand):
+    """Arbeiter-Thread: Klick-Auftraege abholen und berechnen.
+
+    Ausnahmen in berechnen() werden gemeldet und verwerfen nur den
+    jeweiligen Klick, der Thread nimmt weiter Auftraege an.
+    """
+    while True:
+        with zustand["bedingung"]:
+            while not zustand["wartend"]:
+                zustand["bedingung"].wait()
+            nummer, x, y = zustand["wartend"].popleft()
+
+        def abgebrochen(nummer=nummer):
+            """True, sobald zu viele neuere Klicks vorliegen."""
+            return zustand["neueste"] - nummer >= zustand["max_wartend"]
+        if abgebrochen():
+            continue                                  # veralteter Klick
+        try:
+            ergebnis = zustand["berechnen"](x, y, abgebrochen)
+        except Exception:                             # Thread am Leben halten
+            traceback.print_exc()
+            continue
+        if ergebnis is not None:
+            zustand["fertig"].put(ergebnis)
+
+
+def _klicks_zeichnen(zustand, fig):
+    """Timer im GUI-Thread: fertige Ergebnisse an zeichnen() uebergeben."""
+    neu = False
+    while True:
+        try:
+            ergebnis = zustand["fertig"].get_nowait()
+        except queue.Empty:
+            break
+        zustand["zeichnen"](ergebnis)
+        neu = True
+    if neu:                                           # einmal neu zeichnen
+        fig.canvas.draw_idle()
+
+
+def _im_zeichenmodus(event):
+    """Standardfilter: Linksklick in die Achsen, Zoom/Pan nicht aktiv."""
+    toolbar = event.canvas.toolbar
+    modus = toolbar.mode if toolbar is not None else ''
+    return event.button == 1 and event.inaxes is not None and modus == ''
+
+
+def klick_verteiler(fig, berechnen, zeichnen, annehmen=None, arbeiter=2,
+                    max_wartend=4, intervall=50):
+    """Berechne Klick-Orbits in Arbeiter-Threads statt im GUI-Thread.
+
+    Jeder angenommene Klick wird mit seinen Koordinaten in eine Warteschlange
+    gestellt. Liegen mehr als max_wartend neuere Klicks vor, gilt ein
+    Auftrag als veraltet und wird verworfen; berechnen() kann das ueber die
+    uebergebene Funktion abgebrochen() auch waehrend der Rechnung pruefen.
+    Fertige Ergebnisse werden von einem Timer im GUI-Thread an zeichnen()
+    uebergeben, da Matplotlib nicht threadsicher ist.
+
+    Parameter:
+        fig: Matplotlib-Figure
+        berechnen: Funktion berechnen(x, y, abgebrochen), laeuft im
+            Arbeiter-Thread; Rueckgabe None bedeutet "nichts zu zeichnen"
+        zeichnen: Funktion zeichnen(ergebnis), laeuft im GUI-Thread
+        annehmen: Filter annehmen(event) -> bool im GUI-Thread (Default:
+            Linksklick in die Achsen ohne aktiven Zoom)
+        arbeiter: Anzahl der Arbeiter-Threads
+        max_wartend: hoechstens so viele Klicks bleiben aktuell
+        intervall: Abfrageintervall des GUI-Timers in ms
+    Rueckgabe:
+        zustand: Dictionary mit Timer, Warteschlangen und Threads (Referenz
+            halten, sonst beendet die Garbage Collection den Timer)
+    """
+    if annehmen is None:
+        annehmen = _im_zeichenmodus
+    zustand = {"berechnen": berechnen, "zeichnen": zeichnen,
+               "max_wartend": max_wartend, "wartend": collections.deque(),
+               "bedingung": threading.Condition(), "fertig": queue.Queue(),
+               "neueste": 0}
+
+    def klick(event):
+        """Klick annehmen und als Auftrag einreihen (GUI-Thread)."""
+        if not annehmen(event):
+            return
+        with zustand["bedingung"]:
+            zustand["neueste"] += 1
+            zustand["wartend"].append((zustand["neueste"], event.xdata,
+                                       event.ydata))
+            while len(zustand["wartend"]) > max_wartend:
+                zustand["wartend"].popleft()          # veraltete verwerfen
+            zustand["bedingung"].notify()
+    zustand["verbindung"] = fig.canvas.mpl_connect('button_press_event',
+                                                   klick)
+
+    zustand["threads"] = []
+    for i in range(arbeiter):
+        faden = threading.Thread(target=_arbeiter, args=(zustand,))
+        faden.daemon = True
+        faden.start()
+        zustand["threads"].append(faden)
+
+    timer = fig.canvas.new_timer(interval=intervall)
+    timer.add_callback(_klicks_zeichnen, zustand, fig)
+    timer.start()
+    zustand["timer"] = timer
+    return zustand
@@ -5,12 +5,13 @@
 Aufgabe 4. Zur Berechnung der Kurve werden die Messwerte aus der 
 Datei Bewegung.dat numerisch differenziert. Dazu werden 2 verschiedene
 Methoden verwendet: einmal manuell über die Methode der zentralen
-Differentiation und einmal über die eingebaute Funktion gradient() 
-von Numpy."""
+Differentiation und einmal geglättet mit einem Savitzky-Golay-Filter,
+der das Messrauschen nicht verstärkt."""
 
 import numpy as np
 from matplotlib import pyplot as plt
 import math
+from messdaten import zeitableitung, glaettungsableitung
 
 messwerte = np.loadtxt("C:\Users\Nitrox\Documents\Dokumente\Skripte\py\Bewegung.dat")
 
@@ -21,58 +22,22 @@ z = messwerte[:,2] #z-Koordinaten aus Datei
 """Konstanten:"""
 m = 7.257 #Masse des Wurfkörpers
 g = 9.81 #Erdbeschleunigung
-"""Erstellen von leeren Arrays für Zwischenergebnisse:"""
-v = [] #Geschwindigkeitsvektoren
-r = [] #Ortsvektoren
-v_abs = [] #Geschwindigkeitsbetrag
-E_kin = [] #kinetische Energie
-E_pot = [] #potentielle Energie
-E_ges = [] #Gesamtenergie zur Kontrolle
-
-v_new_abs = [] #Geschwindigkeitsbetrag der anders berechneten Geschw.
-E_kin_new = [] #kinetische Energie mit np.gradient()
-E_pot_new = [] #potentielle Energie mit np.gradient()
-E_ges_new = [] #Gesamtenergie mit np.gradient()
-v_new4 = [] #Geschwindigkeitsvektoren mit np.gradient()
 
 # --- 1. Manuelle Berechnung der Energieverläufe
 
-for i in range(0, len(t)):
-	"""Iteriert durch den Datensatz und füllt Array r mit Ortsvektoren."""
-	r.append([x[i], z[i]])
-
-"""Iteriert durch das so eben erzeugte Array r und berechnet jeweils die
-Geschwindigkeit über zentrale Differentiation. Für den Anfangs- und den 
-Endpunkt muss man sich über die lineare Interpolation nach vorne bzw. 
-hinten behelfen."""
-for i in range(0, len(t)):
-		if i < 1:
-			v.append( ( np.array(r[1]) - np.array(r[0]) ) / ( t[1] - t[0] ) )
-			i = i+1
-		elif i > 0 and i < (len(t)-1):
-			v.append( ( np.array(r[i+1]) - np.array(r[i-1]) ) / ( t[i+1] - t[i-1] ) )
-			i = i+1
-		else:
-			v.append( ( np.array(r[len(t)-1]) - np.array(r[len(t)-2]) ) / ( t[len(t)-1] - t[len(t)-2] ) )
-
-for i in range(0, len(t)):
-	"""Berechnet jeweils den Betrag der Geschwindigkeitsvektoren mittels
-	eingebauter Funktion."""
-	v_abs.append(np.linalg.norm(v[i]))
+"""Berechnet die Geschwindigkeitsvektoren über zentrale Differentiation
+für alle Messpunkte auf einmal (Spalten x und z). Für den Anfangs- und
+den Endpunkt werden einseitige Dreipunktformeln verwendet, die auch bei
+ungleichen Zeitabständen die gleiche Ordnung haben."""
+r = np.column_stack((x, z)) #Ortsvektoren
+v = zeitableitung(r, t) #Geschwindigkeitsvektoren
 
-for i in range(0, len(t)):
-	"""Berechnet kinetische Energie mit Geschwindigkeitsbetrag von oben."""
-	E_kin.append(0.5 * m * (v_abs[i])**2)
-
-for i in range(0, len(t)):
-	"""Berechnet potentielle Energie aus z-Koordinate (aus Datei) und
-	Konstanten."""
-	E_pot.append(m * g * z[i])
-
-for i in range(0, len(t)):
-	"""Addiert kinetische und potentielle Energie; wegen Energieerhaltung
-	sollte das im Plot eine Gerade werden."""
-	E_ges.append(E_kin[i] + E_pot[i])
+v_abs = np.sqrt(np.sum(v**2, axis=1)) #Geschwindigkeitsbetrag
+E_kin = 0.5 * m * v_abs**2 #kinetische Energie
+E_pot = m * g * z #potentielle Energie
+"""Wegen Energieerhaltung sollte die Gesamtenergie im Plot eine Gerade
+werden."""
+E_ges = E_kin + E_pot #Gesamtenergie zur Kontrolle
 
 """Plottet die drei Energien mit Legende, Titel und Gitternetz. 
 Eine y-Achse reicht diesmal, da die Einheiten und die Skaleneinteilung 
@@ -88,55 +53,31 @@ ax.legend(loc='lower center', shadow=True) #Legende
 ax.grid()
 
 
-# --- 2. Differentiation mit np.gradient()
-"""np.gradient() ist eine eingebaute Funktion, die in einem Numpy-Array
-mittels zentraler Differentiation (eigentlich genauso wie oben)
-differenziert."""
-
-dt = t[1] - t[0] #Samplingabstand: Zeitabstand zwischen 2 Messpunkten
-
-v_new = np.gradient(np.array([x,z]), dt) #np.gradient() erzeugt Array
-#mit den numerischen Ableitungen an jedem Messpunkt.
-
-"""Die folgenden Umformungen sind zwar etwas unschön, bringen das von
-np.gradient() erzeugte Array in die gleiche Form wie das Array v."""
-v_new2 = np.delete(v_new, 0, 0)
-v_new3 = np.array(v_new2[0])
-v_new_x = np.array(v_new3[0])
-v_new_z = np.array(v_new3[1])
-
-for i in range(0, len(t)):
-	v_new4.append([v_new_x[i], v_new_z[i]])
-
-for i in range(0, len(t)):
-	"""Jetzt kann von jedem Geschwindigkeitsvektor wieder der Betrag
-	berechnet werden."""
-	v_new_abs.append(np.linalg.norm(v_new4[i]))
-
-for i in range(0, len(t)):
-	"""Danach die kinetische Energie, analog zu oben."""
-	E_kin_new.append(0.5 * m * (v_new_abs[i])**2)
+# --- 2. Geglättete Differentiation (Savitzky-Golay)
+"""Zentrale Differenzen (wie oben oder mit np.gradient()) verstärken das
+Rauschen der Messwerte um den Faktor 1/dt. Stattdessen wird durch je 11
+benachbarte Messpunkte eine Parabel gelegt und diese abgeleitet; für
+den schrägen Wurf ist das sogar exakt."""
 
-for i in range(0, len(t)):
-	"""Ebenso die potentielle Energie."""
-	E_pot_new.append(m * g * z[i])
+v_new = glaettungsableitung(r, t, halb=5, grad=2) #geglättete
+#Geschwindigkeitsvektoren
 
-for i in range(0, len(t)):
-	"""Und zum Schluss (Kontrolle) noch einmal die Gesamtenergie."""
-	E_ges_new.append(E_kin_new[i] + E_pot_new[i])
+v_new_abs = np.sqrt(np.sum(v_new**2, axis=1)) #Geschwindigkeitsbetrag
+E_kin_new = 0.5 * m * v_new_abs**2 #kinetische Energie (geglättet)
+E_pot_new = m * g * z #potentielle Energie
+E_ges_new = E_kin_new + E_pot_new #Gesamtenergie zur Kontrolle
 
 """Zuletzt werden diese Energieverläufe in einem neuen Diagramm geplottet.
 Zur Unterscheidung sind die Linien unterschiedlich gezeichnet, mit einer
-Legende versehen und die Diagramme beschriftet. Wie erwartet sehen beide
-Energieverläufe gleich aus, was bedeutet, das np.gradient() genauso
-arbeitet, wie die manuelle Methode."""
+Legende versehen und die Diagramme beschriftet. Die geglättete
+Gesamtenergie schwankt deutlich weniger als die manuell berechnete."""
 fig2, ax2 = plt.subplots()
 ax2.plot(t, E_kin_new, 'k', label='kinetische Energie') #Verlauf der kinetischen Energie
 ax2.plot(t, E_pot_new, 'k:',label='potentielle Energie') #Verlauf der potentiellen Energie
 ax2.plot(t, E_ges_new, 'k--', label='Gesamtenergie') #Verlauf der Gesamtenergie
 plt.xlabel('Zeit in $s$')
 plt.ylabel('Energie in $J$')
-fig2.suptitle('Energien mit numpy.gradient()', fontsize=16)
+fig2.suptitle(u'Energien mit geglätteter Ableitung', fontsize=16)
 ax2.legend(loc='lower center', shadow=True) #Legende
 ax2.grid()
 plt.show()
@@ -12,13 +12,14 @@ Zuletzt soll f(x) geplottet werden."""
 import scipy as sc #enthält bereits math und numpy
 from matplotlib import pyplot as plt
 import scipy.integrate as integ
+from quadratur import regeln, bericht_anlegen, bericht_text
 
 def f(x):
 	"""Angegebene Funktion, von der das Integral berechnet werden soll."""
 	return (sc.log(x**2+5)*sc.cos(0.8*x)+3.5*x)/(sc.e**(x/10))
 
 
-def integral(f,s,a,b):
+def integral(f,s,a,b,**optionen):
 	"""
 	Selbstgeschriebene Funktion, die auf 3 verschiedene Arten das
 	bestimmte Integral einer gegebenen Funktion berechnet. Die Funktion
@@ -26,27 +27,21 @@ def integral(f,s,a,b):
 	untere Grenze als Parameter und berechnet daraus über die 
 	Mittelwertsregel, die Trapezregel und die Simpsonregel jeweils das 
 	Integral.
+	Alle drei Regeln teilen sich eine Auswertung von f an den Grenzen
+	und Mitten der s-1 Teilintervalle. Über optionen (siehe
+	quadratur.auswerten) lassen sich teure, nur skalare Integranden
+	blockweise auf einen Thread- oder Prozesspool verteilen, z.B.
+	integral(f, s, a, b, punktweise=True, pool="prozesse", chunk=256).
 	"""
-	x = sc.linspace(a,b,s)
-	h = x[1]-x[0] #Schrittweite
-	
-	int_mitt_array = []
-	for i in range(0,s-1):
-		int_mitt_array.append(f((x[i+1]+x[i])/2.))	
-	int_mitt = h * sc.sum(int_mitt_array)
+	bericht = optionen.pop("bericht", bericht_anlegen())
+	werte = regeln(f, a, b, s-1, bericht=bericht, **optionen)
+	int_mitt = werte["mittelpunkt"]
 	print "Mittelwertsregel mit " + str(s) + " Stützpunkten:   " + str(int_mitt)
-	
-	int_trapz_array = []
-	for i in range(0,s-1):
-		int_trapz_array.append(((f(x[i+1]))+(f(x[i])))/2.)
-	int_trapz = h * sc.sum(int_trapz_array)
+	int_trapz = werte["trapez"]
 	print "Trapezregel mit " + str(s) + " Stützpunkten:   " + str(int_trapz)
-	
-	int_simps_array = []
-	for i in range(0,s-1):
-		int_simps_array.append((1/6.)*((f(x[i]))+4*(f((x[i]+x[i+1])/2))+f(x[i+1])))
-	int_simps = h * sc.sum(int_simps_array)
+	int_simps = werte["simpson"]
 	print "Simpsonregel mit " + str(s) + " Stützpunkten:   " + str(int_simps)
+	print "Auswertung von f: " + bericht_text(bericht)
 	
 	integral_man = [int_mitt, int_trapz, int_simps]
 	return integral_man
@@ -0,0 +1,183 @@
+"""Jacobi-Matrizen rechter Seiten von Differentialgleichungen.
+
+Die rechten Seiten haben die Signatur von odeint, f(y, t, *args). Ohne
+Dfun bildet odeint die Jacobi-Matrix selbst, mit einem Aufruf von f pro
+Spalte. Mit vektorisiert=True werden alle Stoerungen stattdessen als
+Spalten einer Matrix Y der Groesse (n, k) in einem einzigen Aufruf
+f(Y, t, *args) ausgewertet; das ist nur fuer rechte Seiten richtig, die
+wie rechteSeite/abl elementweise auf y[0], y[1], ... rechnen, nicht fuer
+solche, die ueber y summieren (y.sum(), np.linalg.norm(y), ...). Fuer
+duenn besetzte Systeme werden Spalten ohne gemeinsame Zeilen
+gleichzeitig gestoert (Spaltenfaerbung), so dass die Zahl der
+Stoerungen nicht mit n, sondern nur mit der Zahl der Farben waechst.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from ableitung import STENCILS
+
+
+def faerbung(muster):
+    """Gierige Faerbung der Spalten eines Besetzungsmusters.
+
+    Zwei Spalten erhalten dieselbe Farbe, wenn sie in keiner Zeile beide
+    besetzt sind; dann lassen sie sich mit einer gemeinsamen Stoerung
+    bestimmen.
+
+    Parameter:
+        muster: boolesches Array (n, n) oder scipy.sparse-Matrix,
+            True/ungleich 0, wo df_i/dy_j nicht verschwindet
+    Rueckgabe:
+        farben: Array der Laenge n mit der Farbe jeder Spalte (0, 1, ...)
+    """
+    spalten = sparse.csc_matrix(muster, dtype=bool)
+    n = spalten.shape[1]
+    farben = np.full(n, -1)
+    belegt = []                                       # Zeilen pro Farbe
+    for j in range(n):
+        zeilen = spalten.indices[spalten.indptr[j]:spalten.indptr[j + 1]]
+        for farbe, frei in enumerate(belegt):
+            if not frei[zeilen].any():
+                break
+        else:
+            farbe = len(belegt)
+            belegt.append(np.zeros(spalten.shape[0], dtype=bool))
+        belegt[farbe][zeilen] = True
+        farben[j] = farbe
+    return farben
+
+
+def _auswerten(f, Y, t, args, vektorisiert):
+    """f auf allen Spalten von Y auswerten.
+
+    Vektorisierte rechte Seiten werden einmal mit der ganzen Matrix Y
+    aufgerufen, alle anderen Spalte fuer Spalte.
+    """
+    if vektorisiert:
+        F = np.asarray(f(Y, t, *args))
+        if F.shape != Y.shape:
+            raise ValueError("f(Y) hat die Form %r statt %r; ist f wirklich "
+                             "vektorisiert?" % (F.shape, Y.shape))
+        return F
+    return np.column_stack([f(Y[:, k], t, *args)
+                            for k in range(Y.shape[1])])
+
+
+def jacobi(f, y, t=0.0, args=(), methode="vorwaerts", muster=None,
+           farben=None, duenn=False, vektorisiert=False):
+    """Jacobi-Matrix J[i, j] = df_i/dy_j einer rechten Seite f(y, t, *args).
+
+    Parameter:
+        f: rechte Seite im Format von odeint
+        y: Zustand (Laenge n)
+        t: Zeit
+        args: weitere Argumente fuer f
+        methode: "vorwaerts", "zentral" oder "extrapoliert" (Differenzen
+            aus ableitung.STENCILS), "komplex" (komplexer Schritt, f muss
+            analytisch fortsetzbar sein) oder eine Funktion
+            jac(y, t, *args), die die Matrix analytisch berechnet
+        muster: Besetzungsmuster (n, n) der Matrix; None bedeutet voll
+            besetzt (eine Stoerung pro Spalte)
+        farben: vorberechnete Spaltenfaerbung zu muster (sonst per
+            faerbung() bestimmt)
+        duenn: Ergebnis als scipy.sparse.csr_matrix statt dichtem Array
+        vektorisiert: f rechnet elementweise auf den Zeilen von y und darf
+            mit allen Stoerungen als Spalten einer Matrix (n, k) auf einmal
+            aufgerufen werden; sonst ein Aufruf pro Spalte
+    Rueckgabe:
+        J: Array (n, n) bzw. csr_matrix
+    """
+    if callable(methode):
+        J = methode(y, t, *args)
+        return sparse.csr_matrix(J) if duenn else np.asarray(J)
+
+    y = np.asarray(y, float)
+    n = len(y)
+    if muster is None:
+        farben = np.arange(n)
+    else:
+        muster = sparse.coo_matrix(muster, dtype=bool)
+        if farben is None:
+            farben = faerbung(muster)
+    nfarben = farben.max() + 1
+    # Stoerungsrichtungen: Spalte k stoert alle y_j mit Farbe k
+    richtung = np.zeros((n, nfarben))
+    richtung[np.arange(n), farben] = 1.0
+
+    if methode == "komplex":
+        h = 1e-20*np.maximum(1.0, np.abs(y))
+        Y = y[:, np.newaxis] + 1j*h[:, np.newaxis]*richtung
+        # D[i, k]*h_j = J[i, j] fuer alle j mit Farbe k
+        D = np.imag(_auswerten(f, Y, t, args, vektorisiert))
+    else:
+        stencil = STENCILS[methode]
+        ordnung = stencil["ordnung"]
+        h = (np.finfo(float).eps**(1.0/(ordnung + 1))
+             * np.maximum(1.0, np.abs(y)))
+        stellen = [s for s in stencil["stellen"] if s != 0.0]
+        gewichte = [w for s, w in zip(stencil["stellen"],
+                                      stencil["gewichte"]) if s != 0.0]
+        Y = np.concatenate([y[:, np.newaxis]
+                            + s*h[:, np.newaxis]*richtung
+                            for s in stellen], axis=1)
+        F = _auswerten(f, Y, t, args, vektorisiert)
+        F = F.reshape(n, len(stellen), nfarben)
+        D = np.tensordot(F, gewichte, axes=([1], [0]))
+        if 0.0 in stencil["stellen"]:                 # Vorwaertsdifferenz
+            w0 = stencil["gewichte"][list(stencil["stellen"]).index(0.0)]
+            D += w0*np.asarray(f(y, t, *args))[:, np.newaxis]
+
+    if muster is None:
+        J = D/h[np.newaxis, :]
+        return sparse.csr_matrix(J) if duenn else J
+    zeilen, spalten = muster.row, muster.col
+    werte = D[zeilen, farben[spalten]]/h[spalten]
+    J = sparse.csr_matrix((werte, (zeilen, spalten)), shape=(n, n))
+    return J if duenn else J.toarray()
+
+
+def muster_bestimmen(f, y, t=0.0, args=(), proben=3, streuung=1e-2,
+                     seed=None, vektorisiert=False):
+    """Besetzungsmuster einer rechten Seite durch Stichproben schaetzen.
+
+    Die volle Jacobi-Matrix wird an einigen zufaellig gestoerten Zustaenden
+    um y berechnet; besetzt ist jeder Eintrag, der in einer der Proben
+    nicht verschwindet. Teuer (n Auswertungen pro Probe), lohnt sich aber,
+    wenn die Matrix danach sehr oft gebraucht wird.
+
+    Parameter:
+        f, y, t, args, vektorisiert: wie bei jacobi
+        proben: Anzahl der Stichproben
+        streuung: relative Groesse der Zufallsstoerung
+        seed: Startwert des Zufallsgenerators
+    Rueckgabe:
+        muster: boolesches Array (n, n)
+    """
+    zufall = np.random.RandomState(seed)
+    y = np.asarray(y, float)
+    muster = np.zeros((len(y), len(y)), dtype=bool)
+    for i in range(proben):
+        probe = y + streuung*np.maximum(1.0, np.abs(y))*zufall.randn(len(y))
+        muster |= jacobi(f, probe, t, args, "zentral",
+                         vektorisiert=vektorisiert) != 0.0
+    return muster
+
+
+def dfun(f, methode="vorwaerts", muster=None, vektorisiert=False):
+    """Jacobi-Funktion fuer odeint(f, y0, t, args, Dfun=dfun(f)).
+
+    Die Spaltenfaerbung zu muster wird nur einmal berechnet.
+
+    Parameter:
+        f: rechte Seite im Format von odeint
+        methode, muster, vektorisiert: wie bei jacobi
+    Rueckgabe:
+        Funktion Dfun(y, t, *args) -> Array (n, n)
+    """
+    farben = None if muster is None else faerbung(muster)
+
+    def Dfun(y, t, *args):
+        return jacobi(f, y, t, args, methode, muster, farben,
+                      vektorisiert=vektorisiert)
+    return Dfun
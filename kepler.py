@@ -43,6 +43,9 @@ def KeplerEq_prime(E, eps, t, t0, T):
 
 def ex_Anom(planet, t=0, t0=0):
 	""" Exzentrische Anomalie als Nullstelle der Kepler-Gleichung."""
+	# Ist die Ableitung nicht von Hand bekannt, kann statt KeplerEq_prime
+	# ableitung.ableitungsfunktion(KeplerEq) uebergeben werden (komplexer
+	# Schritt, ebenfalls exakt bis auf Rundung).
 	return opt.newton(KeplerEq, 3, KeplerEq_prime, args=(planet["numEx"], t, t0, planet["Periode"]))
 
 
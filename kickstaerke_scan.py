@@ -0,0 +1,118 @@
+#!/usr/bin/python
+
+"""Phasenraumportraits des gekickten Rotors fuer viele Kickstaerken K.
+
+Fuer jede Kickstaerke wird ein Gitter von Startwerten iteriert und in
+ein Dichte-Histogramm einsortiert; zusaetzlich wird der chaotische
+Flaechenanteil ueber den Lyapunov-Exponenten bestimmt. Die einzelnen
+K-Werte sind unabhaengig voneinander und werden auf einen Prozesspool
+verteilt, so dass ein Scan ueber einige hundert Werte alle Kerne nutzt.
+
+Usage::
+
+    python kickstaerke_scan.py -a 0.5 -b 5.0 -n 200 -o scan
+"""
+
+from __future__ import division
+from __future__ import print_function
+
+import os
+import multiprocessing
+from optparse import OptionParser
+
+import numpy as np
+from matplotlib import pyplot as plt
+
+import abbildungen
+from standardabbildung import chaoskarte
+
+
+def portrait(K, verzeichnis, nbins=512, stufe=6, kicks=2000,
+             lyapunov_bins=200, lyapunov_kicks=200):
+    """Berechne Dichtebild und chaotischen Flaechenanteil fuer ein K.
+
+    Parameter:
+        K: Kickstaerke
+        verzeichnis: Ausgabeverzeichnis fuer Dichte-Array und Bild
+        nbins: Aufloesung des Dichte-Histogramms
+        stufe: 4^stufe gleichmaessig verteilte Startwerte
+        kicks: Kicks pro Orbit fuer das Dichtebild
+        lyapunov_bins: Gitteraufloesung fuer den chaotischen Anteil
+        lyapunov_kicks: Kicks pro Startwert fuer den Lyapunov-Exponenten
+    Rueckgabe:
+        (K, chaotischer Flaechenanteil, mittlerer Lyapunov-Exponent)
+    """
+    H = abbildungen.portrait("standard", K, stufe, kicks, nbins)
+    lam, chaotisch = chaoskarte(lyapunov_bins, lyapunov_kicks, K)
+
+    name = os.path.join(verzeichnis, "dichte_K%.4f" % K)
+    np.save(name + ".npy", H)
+    plt.imsave(name + ".png", np.log1p(H), cmap='gray_r', origin='lower')
+    return K, chaotisch.mean(), lam.mean()
+
+
+def _portrait_argumente(argumente):
+    """Hilfsfunktion fuer Pool.imap_unordered (nur ein Argument)."""
+    K, verzeichnis, optionen = argumente
+    return portrait(K, verzeichnis, **optionen)
+
+
+def k_scan(K_werte, verzeichnis, prozesse=None, **optionen):
+    """Berechne Portraits fuer alle K_werte parallel und schreibe Ergebnisse.
+
+    Parameter:
+        K_werte: Liste oder Array der Kickstaerken
+        verzeichnis: Ausgabeverzeichnis (wird bei Bedarf angelegt)
+        prozesse: Anzahl der Prozesse (Default: alle Kerne)
+        optionen: weitere Parameter fuer portrait()
+    Rueckgabe:
+        ergebnis: Array der Groesse (len(K_werte), 3) mit den Spalten
+            K, chaotischer Flaechenanteil, mittlerer Lyapunov-Exponent
+            (nach K sortiert, auch als zusammenfassung.txt gespeichert)
+    """
+    if not os.path.isdir(verzeichnis):
+        os.makedirs(verzeichnis)
+    auftraege = [(float(K), verzeichnis, optionen) for K in K_werte]
+
+    pool = multiprocessing.Pool(prozesse)
+    try:                                              # ein K pro Auftrag,
+        ergebnis = []                                 # Reihenfolge egal
+        for zeile in pool.imap_unordered(_portrait_argumente, auftraege):
+            ergebnis.append(zeile)
+            print("K = %.4f: chaotischer Anteil %.3f" % zeile[:2])
+    finally:
+        pool.close()
+        pool.join()
+
+    ergebnis = np.array(sorted(ergebnis)).reshape(-1, 3)
+    np.savetxt(os.path.join(verzeichnis, "zusammenfassung.txt"), ergebnis,
+               header="K  chaotischer_Anteil  mittleres_lambda")
+    return ergebnis
+
+
+def main():
+    """Kommandozeilenparameter auswerten und Scan starten."""
+    parser = OptionParser()
+    parser.add_option("-a", dest="kmin", type="float", default=0.0,
+                      help="kleinste Kickstaerke")
+    parser.add_option("-b", dest="kmax", type="float", default=5.0,
+                      help="groesste Kickstaerke")
+    parser.add_option("-n", dest="anzahl", type="int", default=200,
+                      help="Anzahl der K-Werte")
+    parser.add_option("-p", dest="prozesse", type="int", default=None,
+                      help="Anzahl der Prozesse (Default: alle Kerne)")
+    parser.add_option("-o", dest="verzeichnis", default="k_scan",
+                      help="Ausgabeverzeichnis")
+    optionen, _ = parser.parse_args()
+
+    K_werte = np.linspace(optionen.kmin, optionen.kmax, optionen.anzahl)
+    ergebnis = k_scan(K_werte, optionen.verzeichnis, optionen.prozesse)
+
+    plt.plot(ergebnis[:, 0], ergebnis[:, 1], 'k.-')
+    plt.xlabel("$K$")
+    plt.ylabel("chaotischer Flaechenanteil")
+    plt.savefig(os.path.join(optionen.verzeichnis, "zusammenfassung.png"))
+
+
+if __name__ == "__main__":
+    main()
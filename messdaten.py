@@ -0,0 +1,272 @@
+"""Ableitungen gemessener Zeitreihen auf beliebigen Zeitgittern.
+
+Messdaten liegen als Zeiten t (Laenge T) und Werte y der Form (T,) oder
+(T, D) vor, etwa Bewegung.dat mit den Spalten t, x, z. Die Ableitung
+wird spaltenweise mit Dreipunktformeln zweiter Ordnung berechnet, die
+auch bei ungleichmaessigen Zeitabstaenden exakt fuer Parabeln sind; an
+den Raendern werden einseitige Dreipunktformeln derselben Ordnung
+verwendet. Grosse Dateien lassen sich blockweise in einem Durchgang
+verarbeiten (datei_bloecke, zeitableitung_chunks).
+
+Verrauschte Messwerte werden mit glaettungsableitung() differenziert:
+Savitzky-Golay-Filter, d.h. Ableitungen lokaler Ausgleichspolynome, die
+bei gleichmaessigen Zeitabstaenden als vorab berechnete Faltungskerne
+(sg_kern) angewandt werden und bei ungleichmaessigen als ein gemeinsamer
+Aufruf von np.linalg.solve fuer alle Fenster.
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+
+def _spalten(t, y):
+    """Zeiten als Spaltenvektor, passend zu y der Form (T,) oder (T, D)."""
+    return t.reshape((-1,) + (1,)*(y.ndim - 1))
+
+
+def _innen(t, y):
+    """Zentrale Dreipunktformel fuer die Zeilen 1, ..., T-2."""
+    h1 = _spalten(t[1:-1] - t[:-2], y)
+    h2 = _spalten(t[2:] - t[1:-1], y)
+    return ((h1*h1)*y[2:] - (h2*h2)*y[:-2] + (h2*h2 - h1*h1)*y[1:-1]) \
+        / (h1*h2*(h1 + h2))
+
+
+def _anfang(t, y):
+    """Einseitige Dreipunktformel (zweite Ordnung) fuer die erste Zeile."""
+    h1, h2 = t[1] - t[0], t[2] - t[1]
+    return (-(2*h1 + h2)/(h1*(h1 + h2))*y[0] + (h1 + h2)/(h1*h2)*y[1]
+            - h1/(h2*(h1 + h2))*y[2])
+
+
+def _ende(t, y):
+    """Einseitige Dreipunktformel (zweite Ordnung) fuer die letzte Zeile."""
+    h1, h2 = t[-2] - t[-3], t[-1] - t[-2]
+    return (h2/(h1*(h1 + h2))*y[-3] - (h1 + h2)/(h1*h2)*y[-2]
+            + (2*h2 + h1)/(h2*(h1 + h2))*y[-1])
+
+
+def zeitableitung(y, t):
+    """Zeitableitung von Messwerten auf einem (ungleichmaessigen) Gitter.
+
+    Parameter:
+        y: Messwerte, Array der Form (T,) oder (T, D) (eine Spalte pro
+            Koordinate)
+        t: streng monoton wachsende Zeiten, Laenge T >= 2
+    Rueckgabe:
+        Array der Form von y mit dy/dt in jeder Zeile
+    """
+    t = np.asarray(t, float)
+    y = np.asarray(y, float)
+    abl = np.empty_like(y)
+    if len(t) == 2:                                   # nur eine Differenz
+        abl[:] = (y[1] - y[0])/(t[1] - t[0])
+        return abl
+    abl[1:-1] = _innen(t, y)
+    abl[0] = _anfang(t, y)
+    abl[-1] = _ende(t, y)
+    return abl
+
+
+def zeitableitung_chunks(bloecke):
+    """Zeitableitung blockweise in einem Durchgang ueber die Daten.
+
+    Zwischen zwei Bloecken werden nur die letzten beiden Zeilen behalten,
+    so dass der Speicherbedarf unabhaengig von der Laenge der Datei ist.
+    Das Ergebnis stimmt mit zeitableitung() auf den gesamten Daten
+    ueberein.
+
+    Parameter:
+        bloecke: Iterator ueber Bloecke (t, y) mit t der Laenge k und y der
+            Form (k,) oder (k, D), zeitlich aneinander anschliessend
+    Rueckgabe:
+        Generator ueber Bloecke (t, dy/dt); die Zeilen sind gegenueber den
+        Eingabebloecken um eine Zeile verschoben, insgesamt aber
+        vollstaendig
+    """
+    rest_t = rest_y = None
+    erster = True
+    for t, y in bloecke:
+        t = np.asarray(t, float)
+        y = np.asarray(y, float)
+        if rest_t is not None:
+            t = np.concatenate((rest_t, t))
+            y = np.concatenate((rest_y, y))
+        if len(t) < 3:                                # zu wenig Zeilen
+            rest_t, rest_y = t, y
+            continue
+        if erster:
+            abl = np.empty((len(t) - 1,) + y.shape[1:])
+            abl[0] = _anfang(t, y)
+            abl[1:] = _innen(t, y)
+            yield t[:-1], abl
+            erster = False
+        else:
+            yield t[1:-1], _innen(t, y)
+        ende = t[-3:], y[-3:]
+        rest_t, rest_y = t[-2:], y[-2:]
+
+    if rest_t is None:
+        return
+    if erster:                                        # weniger als 3 Zeilen
+        if len(rest_t) == 2:
+            yield rest_t, zeitableitung(rest_y, rest_t)
+        return
+    yield ende[0][-1:], _ende(*ende)[np.newaxis, ...]
+
+
+def datei_bloecke(dateiname, chunk=2**18, kommentar="#"):
+    """Spaltendatei blockweise einlesen (erste Spalte: Zeit).
+
+    Parameter:
+        dateiname: Textdatei mit Spalten t, y_1, ..., y_D
+        chunk: Zeilen pro Block
+        kommentar: Zeilen mit diesem Anfang werden uebersprungen
+    Rueckgabe:
+        Generator ueber Bloecke (t, y) mit y der Form (<= chunk, D)
+    """
+    with open(dateiname) as datei:
+        zeilen = (zeile for zeile in datei if zeile.strip()
+                  and not zeile.lstrip().startswith(kommentar))
+        while True:
+            block = list(itertools.islice(zeilen, chunk))
+            if not block:
+                return
+            daten = np.loadtxt(block, ndmin=2)
+            yield daten[:, 0], daten[:, 1:]
+
+
+def sg_kern(halb, grad, ableitung=1, dt=1.0, stelle=None):
+    """Savitzky-Golay-Faltungskern fuer gleichmaessige Zeitabstaende.
+
+    Durch die 2*halb+1 Punkte eines Fensters wird ein Polynom vom Grad grad
+    nach der Methode der kleinsten Quadrate gelegt; dessen Ableitung an
+    der Stelle stelle ist eine feste Linearkombination der Messwerte, deren
+    Gewichte hier berechnet werden.
+
+    Parameter:
+        halb: halbe Fensterbreite
+        grad: Grad des Ausgleichspolynoms (< 2*halb + 1)
+        ableitung: Ordnung der Ableitung (0: nur glaetten)
+        dt: Zeitabstand der Messpunkte
+        stelle: Index im Fenster, an dem abgeleitet wird (Default: Mitte
+            halb; am Rand der Daten wird das Fenster nicht zentriert)
+    Rueckgabe:
+        Array der Laenge 2*halb+1 mit den Gewichten
+    """
+    if stelle is None:
+        stelle = halb
+    s = np.arange(2*halb + 1) - stelle
+    vandermonde = s[:, np.newaxis]**np.arange(grad + 1)
+    return (math.factorial(ableitung)*np.linalg.pinv(vandermonde)[ableitung]
+            / dt**ableitung)
+
+
+def _sg_gleichmaessig(y, halb, grad, ableitung, dt):
+    """Savitzky-Golay mit vorab berechneten Kernen (O(N) pro Gewicht)."""
+    breite = 2*halb + 1
+    abl = np.empty_like(y)
+    kern = sg_kern(halb, grad, ableitung, dt)
+    innen = abl[halb:len(y) - halb]
+    innen[...] = kern[0]*y[:len(y) - breite + 1]
+    for k in range(1, breite):                        # Faltung: ein Durchgang
+        innen += kern[k]*y[k:len(y) - breite + 1 + k]  # pro Gewicht
+    rand = np.array([sg_kern(halb, grad, ableitung, dt, stelle)
+                     for stelle in range(breite)])
+    abl[:halb] = np.tensordot(rand[:halb], y[:breite], axes=1)
+    abl[len(y) - halb:] = np.tensordot(rand[halb + 1:], y[-breite:], axes=1)
+    return abl
+
+
+def _sg_ungleichmaessig(y, t, halb, grad, ableitung):
+    """Lokale Ausgleichspolynome fuer alle Fenster in einem Aufruf."""
+    breite = 2*halb + 1
+    anfang = np.clip(np.arange(len(t)) - halb, 0, len(t) - breite)
+    index = anfang[:, np.newaxis] + np.arange(breite)     # (N, breite)
+    skala = (t[index[:, -1]] - t[index[:, 0]])[:, np.newaxis]
+    s = (t[index] - t[:, np.newaxis])/skala              # gut konditioniert
+    vandermonde = s[..., np.newaxis]**np.arange(grad + 1)
+    vt = np.swapaxes(vandermonde, 1, 2)
+    gewichte = np.linalg.solve(np.matmul(vt, vandermonde), vt)[:, ableitung]
+    gewichte *= math.factorial(ableitung)/skala**ableitung   # (N, breite)
+    gewichte = gewichte.reshape(gewichte.shape + (1,)*(y.ndim - 1))
+    return np.sum(gewichte*y[index], axis=1)
+
+
+def glaettungsableitung(y, t=None, halb=5, grad=2, ableitung=1, dt=1.0):
+    """Geglaettete Ableitung verrauschter Messwerte (Savitzky-Golay).
+
+    Statt benachbarte Messwerte direkt zu differenzieren (was das Rauschen
+    mit 1/dt verstaerkt) wird in jedem Fenster von 2*halb+1 Punkten ein
+    Polynom vom Grad grad angepasst und dieses abgeleitet. An den Raendern
+    wird das Fenster nicht zentriert, sondern an den Daten ausgerichtet.
+    Sind die Zeiten gleichmaessig verteilt, werden vorab berechnete Kerne
+    gefaltet; sonst werden alle lokalen Ausgleichsprobleme gemeinsam
+    geloest.
+
+    Parameter:
+        y: Messwerte, Array der Form (T,) oder (T, D)
+        t: Zeiten (Laenge T); None bedeutet gleichmaessiger Abstand dt
+        halb: halbe Fensterbreite (2*halb + 1 <= T)
+        grad: Grad des Ausgleichspolynoms (grad >= ableitung)
+        ableitung: Ordnung der Ableitung (0: nur glaetten)
+        dt: Zeitabstand, wenn t nicht angegeben ist
+    Rueckgabe:
+        Array der Form von y mit der geglaetteten Ableitung
+    """
+    y = np.asarray(y, float)
+    if not ableitung <= grad < 2*halb + 1 <= len(y):
+        raise ValueError("es muss ableitung <= grad < 2*halb+1 <= T gelten")
+    if t is not None and len(y) > 1:
+        t = np.asarray(t, float)
+        abstand = np.diff(t)
+        if not np.allclose(abstand, abstand[0], rtol=1e-6, atol=0.0):
+            return _sg_ungleichmaessig(y, t, halb, grad, ableitung)
+        dt = (t[-1] - t[0])/(len(t) - 1)
+    return _sg_gleichmaessig(y, halb, grad, ableitung, dt)
+
+
+def glaettungsableitung_chunks(bloecke, halb=5, grad=2, ableitung=1):
+    """Geglaettete Ableitung blockweise in einem Durchgang ueber die Daten.
+
+    Zwischen zwei Bloecken werden 2*halb Zeilen behalten und neu
+    berechnet, so dass jede Zeile dasselbe Fenster sieht wie bei
+    glaettungsableitung() auf den gesamten Daten. Hat die ganze Datei
+    weniger als 2*halb+1 Zeilen, wird mit dem groessten passenden Fenster
+    (und hoechstens dem Grad 2*halb) abgeleitet; dafuer braucht es
+    mindestens ableitung+1 Zeilen, aufgerundet auf eine ungerade Zahl.
+
+    Parameter:
+        bloecke: Iterator ueber Bloecke (t, y) wie bei zeitableitung_chunks
+        halb, grad, ableitung: wie bei glaettungsableitung
+    Rueckgabe:
+        Generator ueber Bloecke (t, Ableitung)
+    """
+    rest_t = rest_y = letzte = None
+    for t, y in bloecke:
+        t = np.asarray(t, float)
+        y = np.asarray(y, float)
+        if rest_t is not None:
+            t = np.concatenate((rest_t, t))
+            y = np.concatenate((rest_y, y))
+        if len(t) < 2*halb + 1:                       # Fenster noch nicht voll
+            rest_t, rest_y = t, y
+            continue
+        abl = glaettungsableitung(y, t, halb, grad, ableitung)
+        anfang = 0 if letzte is None else halb
+        yield t[anfang:len(t) - halb], abl[anfang:len(t) - halb]
+        rest_t, rest_y = t[len(t) - 2*halb:], y[len(t) - 2*halb:]
+        letzte = t[len(t) - halb:], abl[len(t) - halb:]
+
+    if letzte is not None:
+        yield letzte
+    elif rest_t is not None:                          # weniger Zeilen als
+        halb = (len(rest_t) - 1)//2                   # ein Fenster: kleineres
+        grad = min(grad, 2*halb)                      # Fenster und Polynom
+        if grad < ableitung:
+            raise ValueError("zu wenig Zeilen (%d) fuer die %d. Ableitung"
+                             % (len(rest_t), ableitung))
+        yield rest_t, glaettungsableitung(rest_y, rest_t, halb, grad,
+                                          ableitung)
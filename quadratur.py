@@ -0,0 +1,625 @@
+"""Numerische Integration mit Fehlerschaetzung.
+
+Die Uebungen 3_1_* integrieren mit Mittelpunkt-, Trapez- und Simpsonregel
+auf festen, gleichmaessigen Gittern und muessen die Zahl der Teilintervalle
+hochdrehen, um die erreichte Genauigkeit abzuschaetzen. adaptiv() verfeinert
+stattdessen nur Teilintervalle mit grossem lokalem Fehler. Alle Intervalle
+einer Verfeinerungsstufe werden dabei gemeinsam in einem vektorisierten
+Aufruf des Integranden ausgewertet.
+
+Fuer Konvergenzstudien berechnet trapez_folge() die Trapezsummen fuer
+N = 1, 2, 4, ... verschachtelt, d.h. jede Stufe wertet nur die neuen
+Mittelpunkte aus; romberg() extrapoliert diese Folge nach Richardson.
+konvergenzstudie() bildet fuer beliebige Listen von N alle drei Regeln
+aus einer gemeinsamen Auswertung der 2N+1 Stuetzstellen; N mit
+gemeinsamer Verfeinerung (etwa N und 2N) teilen sich zusaetzlich ein
+Gitter. Zwischen verschiedenen Gruppen gemeinsame Punkte (Raender,
+gemeinsame Teiler) werden erneut ausgewertet, so dass bei
+logarithmisch verteilten N der Grossteil der Ersparnis aus den
+gemeinsamen Stuetzstellen der Regeln stammt. Grosse Gitter laufen auf
+Wunsch in einem Prozesspool.
+
+Teure Integranden, die nur Skalare verarbeiten, wertet auswerten()
+blockweise in einem Thread- oder Prozesspool aus; regeln() berechnet
+damit alle drei Fest-N-Regeln aus einer Auswertung, und ein Bericht
+zaehlt Auswertungen, Aufrufe und Rechenzeit.
+
+Unstetige Integranden (etwa die Heaviside-Funktion in 3_1_*) setzen jede
+Regel auf Ordnung h herab. Mit bekannten oder per spruenge_suchen()
+gefundenen Sprungstellen zerlegt stueckweise() das Intervall, so dass
+jede Regel auf glatten Teilstuecken wieder ihre volle Ordnung hat.
+"""
+
+from __future__ import division
+
+import multiprocessing
+import multiprocessing.pool
+import threading
+import time
+
+import numpy as np
+
+
+# Gauss-Kronrod-Regel mit 15 Knoten (Kronrod) und den 7 eingebetteten
+# Gauss-Knoten, Knoten und Gewichte fuer [-1, 1] (aus QUADPACK)
+_GK_KNOTEN = np.array([0.991455371120812639206854697526329,
+                       0.949107912342758524526189684047851,
+                       0.864864423359769072789712788640926,
+                       0.741531185599394439863864773280788,
+                       0.586087235467691130294144845693013,
+                       0.405845151377397166906606412076961,
+                       0.207784955007898467600689403773245,
+                       0.0])
+_GK_KRONROD = np.array([0.022935322010529224963732008058970,
+                        0.063092092629978553290700663189204,
+                        0.104790010322250183839876322541518,
+                        0.140653259715525918745189590510238,
+                        0.169004726639267902826583426598550,
+                        0.190350578064785409913256402421014,
+                        0.204432940075298892414161999234649,
+                        0.209482141084727828012999174891714])
+_GK_GAUSS = np.array([0.0, 0.129484966168869693270611432679082,
+                      0.0, 0.279705391489276667901467771423780,
+                      0.0, 0.381830050505118944950369775488975,
+                      0.0, 0.417959183673469387755102040816327])
+KNOTEN = np.concatenate((-_GK_KNOTEN[:-1], _GK_KNOTEN[::-1]))
+GEWICHTE_KRONROD = np.concatenate((_GK_KRONROD[:-1], _GK_KRONROD[::-1]))
+GEWICHTE_GAUSS = np.concatenate((_GK_GAUSS[:-1], _GK_GAUSS[::-1]))
+
+
+def _kronrod(f, links, rechts):
+    """Kronrod-Wert und Fehlerschaetzung |K15 - G7| fuer viele Intervalle."""
+    mitte = 0.5*(links + rechts)
+    halb = 0.5*(rechts - links)
+    werte = f(mitte[:, np.newaxis] + halb[:, np.newaxis]*KNOTEN)
+    kronrod = halb*werte.dot(GEWICHTE_KRONROD)
+    gauss = halb*werte.dot(GEWICHTE_GAUSS)
+    return kronrod, np.abs(kronrod - gauss), werte.size
+
+
+def _adaptiv_kronrod(f, a, b, tol, max_stufen):
+    """Stufenweise Bisektion mit Gauss-Kronrod-Regel auf jedem Intervall."""
+    links, rechts = np.array([a], float), np.array([b], float)
+    wert = fehler = 0.0
+    auswertungen = 0
+    for stufe in range(max_stufen + 1):
+        teil, schaetzung, anzahl = _kronrod(f, links, rechts)
+        auswertungen += anzahl
+        fertig = schaetzung <= tol*(rechts - links)/(b - a)
+        if stufe == max_stufen:                       # Rest uebernehmen
+            fertig[:] = True
+        wert += teil[fertig].sum()
+        fehler += schaetzung[fertig].sum()
+        if fertig.all():
+            break
+        links, rechts = links[~fertig], rechts[~fertig]
+        mitte = 0.5*(links + rechts)
+        links, rechts = (np.concatenate((links, mitte)),
+                         np.concatenate((mitte, rechts)))
+    return wert, fehler, auswertungen
+
+
+def _adaptiv_simpson(f, a, b, tol, max_stufen):
+    """Adaptive Simpsonregel; die Funktionswerte der Eltern werden weiter
+    verwendet, pro Intervall und Stufe kommen nur zwei Viertelpunkte hinzu.
+    """
+    links, rechts = np.array([a], float), np.array([b], float)
+    mitte = 0.5*(links + rechts)
+    fl, fm, fr = f(np.concatenate((links, mitte, rechts)))
+    fl, fm, fr = np.atleast_1d(fl), np.atleast_1d(fm), np.atleast_1d(fr)
+    auswertungen = 3
+    wert = fehler = 0.0
+    for stufe in range(max_stufen + 1):
+        h = rechts - links
+        viertel = np.concatenate((links + 0.25*h, rechts - 0.25*h))
+        fv = f(viertel)
+        auswertungen += fv.size
+        flv, frv = fv[:len(h)], fv[len(h):]
+        grob = h/6*(fl + 4*fm + fr)
+        fein = h/12*(fl + 4*flv + 2*fm + 4*frv + fr)
+        schaetzung = np.abs(fein - grob)/15
+        fertig = schaetzung <= tol*h/(b - a)
+        if stufe == max_stufen:
+            fertig[:] = True
+        wert += (fein + (fein - grob)/15)[fertig].sum()   # Richardson
+        fehler += schaetzung[fertig].sum()
+        if fertig.all():
+            break
+        weiter = ~fertig
+        links, mitte, rechts = links[weiter], mitte[weiter], rechts[weiter]
+        fl, flv, fm, frv, fr = (fl[weiter], flv[weiter], fm[weiter],
+                                frv[weiter], fr[weiter])
+        links, rechts = (np.concatenate((links, mitte)),
+                         np.concatenate((mitte, rechts)))
+        fl, fm, fr = (np.concatenate((fl, fm)), np.concatenate((flv, frv)),
+                      np.concatenate((fm, fr)))
+        mitte = 0.5*(links + rechts)
+    return wert, fehler, auswertungen
+
+
+def adaptiv(f, a, b, tol=1e-10, methode="kronrod", max_stufen=40):
+    """Adaptive Integration von f ueber [a, b] mit Fehlerschaetzung.
+
+    Auf jeder Stufe wird fuer alle noch offenen Teilintervalle der lokale
+    Fehler geschaetzt. Intervalle mit Fehler <= tol*Breite/(b - a) werden
+    uebernommen, alle anderen halbiert und auf der naechsten Stufe erneut
+    behandelt. Die Knoten einer Stufe werden gemeinsam in einem Aufruf
+    von f ausgewertet; f muss daher Arrays beliebiger Form akzeptieren.
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Integrationsgrenzen
+        tol: angestrebter absoluter Fehler
+        methode: "kronrod" (Gauss-Kronrod 7/15 pro Intervall) oder
+            "simpson" (adaptive Simpsonregel mit Richardson-Korrektur)
+        max_stufen: maximale Anzahl der Halbierungen
+    Rueckgabe:
+        wert: Integral
+        fehler: Summe der lokalen Fehlerschaetzungen
+        auswertungen: Anzahl der Funktionsauswertungen
+    """
+    if a == b:
+        return 0.0, 0.0, 0
+    if methode == "kronrod":
+        return _adaptiv_kronrod(f, a, b, tol, max_stufen)
+    if methode == "simpson":
+        return _adaptiv_simpson(f, a, b, tol, max_stufen)
+    raise ValueError("unbekannte Methode: %r" % (methode,))
+
+
+def _trapez_anfang(f, a, b):
+    """Trapezsumme mit einem Teilintervall."""
+    return 0.5*(b - a)*np.sum(f(np.array([a, b], float)))
+
+
+def _trapez_schritt(f, a, b, T, k):
+    """Trapezsumme fuer 2^k Teilintervalle aus der fuer 2^(k-1).
+
+    Rueckgabe: neue Trapezsumme, Anzahl der neu ausgewerteten Punkte
+    """
+    n = 2**(k - 1)
+    h = (b - a)/n
+    return 0.5*T + 0.5*h*np.sum(f(a + h*(np.arange(n) + 0.5))), n
+
+
+def trapez_folge(f, a, b, stufen):
+    """Verschachtelte Trapezsummen fuer N = 1, 2, 4, ..., 2**stufen.
+
+    Beim Verdoppeln von N bleiben alle alten Stuetzstellen erhalten; pro
+    Stufe werden nur die neuen Mittelpunkte (in einem Aufruf) ausgewertet:
+
+        T_{2N} = T_N/2 + h_{2N} * sum f(neue Mittelpunkte)
+
+    Aus der Folge ergeben sich auch Mittelpunkt- und Simpsonregel mit N
+    Teilintervallen: M_N = 2 T_{2N} - T_N, S_N = (4 T_{2N} - T_N)/3.
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Integrationsgrenzen
+        stufen: Anzahl der Verdopplungen
+    Rueckgabe:
+        T: Array der Laenge stufen+1 mit den Trapezsummen T_{2^k}
+        auswertungen: Anzahl der Funktionsauswertungen (2**stufen + 1)
+    """
+    T = np.empty(stufen + 1)
+    T[0] = _trapez_anfang(f, a, b)
+    auswertungen = 2
+    for k in range(1, stufen + 1):
+        T[k], neu = _trapez_schritt(f, a, b, T[k - 1], k)
+        auswertungen += neu
+    return T, auswertungen
+
+
+def romberg(f, a, b, stufen=20, tol=None):
+    """Romberg-Integration: Richardson-Extrapolation der Trapezsummen.
+
+    Zeile k des Tableaus beginnt mit T_{2^k}; Spalte j eliminiert den
+    Fehlerterm h^(2j), R[k, j] hat also die Ordnung h^(2j+2). Die
+    Trapezsummen werden wie in trapez_folge verschachtelt berechnet.
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Integrationsgrenzen
+        stufen: maximale Anzahl der Verdopplungen
+        tol: Abbruch, sobald sich zwei Diagonalelemente um hoechstens tol
+            unterscheiden (None: alle Stufen rechnen)
+    Rueckgabe:
+        wert: letztes Diagonalelement R[k, k]
+        fehler: |R[k, k] - R[k-1, k-1]| als Fehlerschaetzung
+        tabelle: Array (k+1, k+1), oberhalb der Diagonale NaN
+        auswertungen: Anzahl der Funktionsauswertungen
+    """
+    tabelle = np.full((stufen + 1, stufen + 1), np.nan)
+    tabelle[0, 0] = _trapez_anfang(f, a, b)
+    auswertungen = 2
+    fehler = np.inf
+    k = 0
+    for k in range(1, stufen + 1):
+        tabelle[k, 0], neu = _trapez_schritt(f, a, b, tabelle[k - 1, 0], k)
+        auswertungen += neu
+        for j in range(1, k + 1):
+            tabelle[k, j] = (tabelle[k, j - 1]
+                             + (tabelle[k, j - 1] - tabelle[k - 1, j - 1])
+                             / (4.0**j - 1.0))
+        fehler = abs(tabelle[k, k] - tabelle[k - 1, k - 1])
+        if tol is not None and fehler <= tol:
+            break
+    tabelle = tabelle[:k + 1, :k + 1]
+    return tabelle[k, k], fehler, tabelle, auswertungen
+
+
+# Fest-N-Regeln aus Trapezsumme T und Mittelpunktsumme M auf N Intervallen
+REGELN = {
+    "mittelpunkt": lambda T, M: M,
+    "trapez": lambda T, M: T,
+    "simpson": lambda T, M: (T + 2*M)/3,
+}
+
+
+def _ggt(a, b):
+    """Groesster gemeinsamer Teiler (auch fuer grosse Python-Integer)."""
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _kgv(a, b):
+    """Kleinstes gemeinsames Vielfaches."""
+    return a//_ggt(a, b)*b
+
+
+def _gruppieren(N, max_punkte):
+    """Fasse N zu Gruppen mit gemeinsamem Verfeinerungsgitter zusammen.
+
+    Jede Gruppe hat ein Gitter aus 2L+1 Punkten (L = kgV ihrer N, halbe
+    Schritte fuer die Mittelpunkte) mit 2L+1 <= max_punkte. Ein N wird
+    nur dann in eine Gruppe aufgenommen, wenn das gemeinsame Gitter um
+    hoechstens so viele Punkte waechst, wie ein eigenes Gitter kosten
+    wuerde; sonst bildet es eine neue Gruppe.
+    """
+    gruppen = []                                      # [L, [N, ...]]
+    for n in sorted(set(int(n) for n in N), reverse=True):
+        for gruppe in gruppen:
+            L = _kgv(gruppe[0], n)
+            if 2*L + 1 <= max_punkte and L - gruppe[0] <= n:
+                gruppe[0] = L
+                gruppe[1].append(n)
+                break
+        else:
+            gruppen.append([n, [n]])
+    return gruppen
+
+
+def _gruppe_auswerten(argumente):
+    """Werte f einmal auf dem Gitter einer Gruppe aus (auch im Pool).
+
+    Rueckgabe: Dictionary N -> (Trapezsumme, Mittelpunktsumme)
+    """
+    f, a, b, L, N, chunk = argumente
+    werte = np.empty(2*L + 1)
+    for start in range(0, 2*L + 1, chunk):            # blockweise, damit die
+        ende = min(start + chunk, 2*L + 1)            # Zwischenarrays klein
+        k = np.arange(start, ende)                    # bleiben
+        x = a + (b - a)*k/(2.0*L)
+        x[k == 2*L] = b                               # exakt, nicht gerundet
+        werte[start:ende] = f(x)
+    summen = {}
+    for n in N:
+        s = L//n                                      # Schritt in Intervallen
+        h = (b - a)/n
+        trapez = h*(werte[::2*s].sum() - 0.5*(werte[0] + werte[-1]))
+        mitte = h*werte[s::2*s].sum()
+        summen[n] = (trapez, mitte)
+    return summen
+
+
+def konvergenzstudie(f, a, b, N,
+                     regeln=("mittelpunkt", "trapez", "simpson"),
+                     exakt=None, max_punkte=2**22, chunk=2**18,
+                     prozesse=0, parallel_ab=2**20, knicke=None):
+    """Fest-N-Regeln fuer viele N mit gemeinsamen Funktionsauswertungen.
+
+    Die N werden zu Gruppen zusammengefasst, deren kleinstes gemeinsames
+    Vielfaches L klein genug ist; f wird pro Gruppe einmal auf dem Gitter
+    mit 2L Halbschritten ausgewertet. Punkte, die mehrere Gruppen gemeinsam
+    haben, werden in jeder Gruppe ausgewertet. Trapez- und Mittelpunktsummen aller N
+    der Gruppe sind dann Summen ueber Gitterpunkte mit Schrittweite L/N,
+    die Simpsonregel setzt sich aus beiden zusammen. Auf Wunsch
+    (prozesse != 0) laufen Gruppen mit mindestens parallel_ab Punkten in
+    einem Prozesspool; f muss dann auf Modulebene definiert sein, damit
+    es sich picklen laesst (keine lambdas oder Closures).
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Integrationsgrenzen
+        N: Liste der Teilintervallanzahlen
+        regeln: Schluessel in REGELN
+        exakt: exakter Wert; dann werden relative Fehler zurueckgegeben
+        max_punkte: groesstes gemeinsames Gitter
+        chunk: Punkte pro Aufruf von f
+        prozesse: Groesse des Prozesspools (0: keiner, alles seriell;
+            None: alle Kerne)
+        parallel_ab: Gittergroesse, ab der eine Gruppe in den Pool geht
+        knicke: Sprungstellen von f (Punkte oder Klammern wie bei
+            stueckweise); die N Teilintervalle werden dann anteilig auf
+            die glatten Teilstuecke verteilt
+    Rueckgabe:
+        h: Array der Schrittweiten (b - a)/N in der Reihenfolge von N
+        tabelle: Dictionary regel -> Array der Integrale bzw. der
+            Betraege der relativen Fehler (wenn exakt angegeben ist)
+        auswertungen: Anzahl der Funktionsauswertungen
+    """
+    N = np.asarray(N, dtype=int)
+    if knicke is not None and len(knicke):
+        tabelle = dict((regel, np.zeros(len(N))) for regel in regeln)
+        auswertungen = 0
+        for links, rechts in _teilstuecke(a, b, knicke):
+            n = np.maximum(1, np.rint(N*(rechts - links)/(b - a)))
+            _, teil, anzahl = konvergenzstudie(
+                f, links, rechts, n.astype(int), regeln, None, max_punkte,
+                chunk, prozesse, parallel_ab)
+            for regel in regeln:
+                tabelle[regel] += teil[regel]
+            auswertungen += anzahl
+        if exakt is not None:
+            for regel in regeln:
+                tabelle[regel] = np.abs((tabelle[regel] - exakt)/exakt)
+        return (b - a)/N, tabelle, auswertungen
+    gruppen = _gruppieren(N, max_punkte)
+    auftraege = [(f, a, b, L, ns, chunk) for L, ns in gruppen]
+    gross = [auftrag for auftrag in auftraege
+             if 2*auftrag[3] + 1 >= parallel_ab]
+    klein = [auftrag for auftrag in auftraege
+             if 2*auftrag[3] + 1 < parallel_ab]
+
+    summen = {}
+    for auftrag in klein:
+        summen.update(_gruppe_auswerten(auftrag))
+    if gross and prozesse != 0:
+        pool = multiprocessing.Pool(prozesse)
+        try:
+            for teil in pool.imap_unordered(_gruppe_auswerten, gross):
+                summen.update(teil)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for auftrag in gross:
+            summen.update(_gruppe_auswerten(auftrag))
+
+    T = np.array([summen[n][0] for n in N])
+    M = np.array([summen[n][1] for n in N])
+    tabelle = {}
+    for regel in regeln:
+        wert = REGELN[regel](T, M)
+        tabelle[regel] = (wert if exakt is None
+                          else np.abs((wert - exakt)/exakt))
+    auswertungen = sum(2*L + 1 for L, ns in gruppen)
+    return (b - a)/N, tabelle, auswertungen
+
+
+def bericht_anlegen():
+    """Leerer Bericht fuer auswerten(): Auswertungen, Aufrufe, Zeit [s]."""
+    return {"auswertungen": 0, "aufrufe": 0, "zeit": 0.0,
+            "sperre": threading.Lock()}
+
+
+def bericht_text(bericht):
+    """Bericht als einzeiliger Text."""
+    zeit = bericht["zeit"]
+    rate = bericht["auswertungen"]/zeit if zeit > 0 else float("inf")
+    return ("%d Auswertungen in %d Aufrufen, %.3g s (%.3g Auswertungen/s)"
+            % (bericht["auswertungen"], bericht["aufrufe"], zeit, rate))
+
+
+def _block_auswerten(argumente):
+    """Einen Block von Stuetzstellen auswerten (auch im Pool)."""
+    f, x, punktweise = argumente
+    if punktweise:
+        return np.array([f(xi) for xi in x], dtype=float)
+    return np.asarray(f(x), dtype=float)
+
+
+def auswerten(f, x, punktweise=False, pool=None, chunk=1024, arbeiter=None,
+              bericht=None):
+    """Werte f auf allen Stuetzstellen x aus, wahlweise parallel.
+
+    Parameter:
+        f: Integrand; vektorisiert oder (punktweise=True) nur fuer Skalare
+        x: Array der Stuetzstellen (wird flach verarbeitet)
+        punktweise: f einzeln fuer jeden Punkt aufrufen
+        pool: None (im aufrufenden Thread), "threads" (Threadpool, lohnt
+            sich wenn f den GIL freigibt, z.B. NumPy oder I/O),
+            "prozesse" (Prozesspool, f muss sich picklen lassen) oder ein
+            vorhandener Pool mit map()
+        chunk: Stuetzstellen pro Block im Pool
+        arbeiter: Anzahl der Threads/Prozesse (None: alle Kerne)
+        bericht: Dictionary aus bericht_anlegen(), wird fortgeschrieben
+    Rueckgabe:
+        Array der Form von x mit den Funktionswerten
+    """
+    x = np.asarray(x, float)
+    flach = x.ravel()
+    start = time.time()
+    if pool is None:
+        werte = _block_auswerten((f, flach, punktweise))
+        aufrufe = len(flach) if punktweise else 1
+    else:
+        bloecke = [(f, flach[i:i + chunk], punktweise)
+                   for i in range(0, len(flach), chunk)]
+        if pool == "threads":
+            ausfuehrung = multiprocessing.pool.ThreadPool(arbeiter)
+        elif pool == "prozesse":
+            ausfuehrung = multiprocessing.Pool(arbeiter)
+        else:
+            ausfuehrung = pool
+        try:
+            teile = ausfuehrung.map(_block_auswerten, bloecke)
+        finally:
+            if ausfuehrung is not pool:
+                ausfuehrung.close()
+                ausfuehrung.join()
+        werte = np.concatenate(teile) if teile else np.empty(0)
+        aufrufe = len(flach) if punktweise else len(bloecke)
+    if bericht is not None:
+        with bericht["sperre"]:
+            bericht["auswertungen"] += len(flach)
+            bericht["aufrufe"] += aufrufe
+            bericht["zeit"] += time.time() - start
+    return werte.reshape(x.shape)
+
+
+def regeln(f, a, b, n, **optionen):
+    """Mittelpunkt-, Trapez- und Simpsonregel mit n Teilintervallen.
+
+    Alle drei Regeln teilen sich die 2n+1 Stuetzstellen (Intervallgrenzen
+    und -mitten), die in einem Durchgang von auswerten() berechnet werden.
+
+    Parameter:
+        f: Integrand
+        a, b: Integrationsgrenzen
+        n: Anzahl der Teilintervalle
+        optionen: punktweise, pool, chunk, arbeiter, bericht (siehe
+            auswerten)
+    Rueckgabe:
+        Dictionary regel -> Integral fuer die Schluessel in REGELN
+    """
+    werte = auswerten(f, np.linspace(a, b, 2*n + 1), **optionen)
+    h = (b - a)/n
+    T = h*(werte[::2].sum() - 0.5*(werte[0] + werte[-1]))
+    M = h*werte[1::2].sum()
+    return dict((regel, REGELN[regel](T, M)) for regel in REGELN)
+
+
+def _teilstuecke(a, b, knicke):
+    """Teilintervalle zwischen den Sprungstellen in (a, b).
+
+    Eine Sprungstelle ist entweder ein Punkt k oder ein Klammerpaar
+    (links, rechts) aus spruenge_suchen(). An einem Punkt endet das linke
+    Teilstueck eine Gleitkommastelle vor k und das rechte beginnt eine
+    danach, damit Regeln mit Randpunkten die einseitigen Grenzwerte von f
+    sehen und nicht den Wert an der Sprungstelle selbst.
+    """
+    klammern = []
+    for knick in knicke:
+        knick = np.atleast_1d(np.asarray(knick, float))
+        if len(knick) == 1:
+            knick = (np.nextafter(knick[0], -np.inf),
+                     np.nextafter(knick[0], np.inf))
+        if a < knick[0] and knick[1] < b:
+            klammern.append((knick[0], knick[1]))
+    klammern.sort()
+    stuecke = []
+    links = a
+    for ende, anfang in klammern:
+        if ende > links:
+            stuecke.append((links, ende))
+        links = max(links, anfang)
+    stuecke.append((links, b))
+    return stuecke
+
+
+def spruenge_suchen(f, a, b, n=32, schwelle=None, tol=None, max_iter=64):
+    """Sprungstellen von f in [a, b] durch Bisektion finden.
+
+    f wird auf n gleichen Teilintervallen ausgewertet; jedes Intervall,
+    in dem sich f um mehr als schwelle aendert, ist ein Kandidat. Alle
+    Kandidaten werden gemeinsam halbiert, wobei jeweils die Haelfte mit
+    der groesseren Aenderung behalten wird. Bei einem Sprung bleibt die
+    Aenderung erhalten, bei einem glatten Verlauf sinkt sie mit der
+    Intervallbreite; ein Kandidat, dessen Aenderung unter die Haelfte der
+    groessten bisher gesehenen faellt, wird sofort verworfen. Glatte
+    Intervalle kosten so nur wenige Auswertungen, nur echte Spruenge
+    werden bis auf tol eingeschachtelt. Zurueckgegeben wird die Klammer
+    um den Sprung, deren Enden sicher auf der jeweiligen Seite liegen.
+
+    Das grobe Gitter uebersieht Spruenge nur, wenn sich in einem
+    Teilintervall Sprung und glatter Anteil gegenseitig aufheben; dann
+    hilft ein groesseres n.
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Suchintervall
+        n: Anzahl der Teilintervalle der Suche
+        schwelle: Mindestaenderung eines Kandidaten (Default:
+            1e-12*max|f|, d.h. nur konstante Intervalle entfallen)
+        tol: Breite, bis zu der halbiert wird (Default: einige
+            Gleitkommastellen von max(|a|, |b|))
+        max_iter: maximale Anzahl der Halbierungen
+    Rueckgabe:
+        Array (K, 2) der Klammern (links, rechts) um die Spruenge,
+        aufsteigend sortiert; verwendbar als knicke fuer stueckweise()
+        und konvergenzstudie()
+    """
+    x = np.linspace(a, b, n + 1)
+    y = np.asarray(f(x), float)
+    aenderung = np.abs(np.diff(y))
+    if schwelle is None:
+        schwelle = 1e-12*np.max(np.abs(y))
+    if tol is None:
+        tol = 4*np.finfo(float).eps*max(abs(a), abs(b), 1e-300)
+    kandidat = np.nonzero(aenderung > schwelle)[0]
+    links, rechts = x[kandidat], x[kandidat + 1]
+    fl, fr = y[kandidat], y[kandidat + 1]
+    groesste = aenderung[kandidat]
+    for i in range(max_iter):
+        offen = rechts - links > tol
+        if not offen.any():
+            break
+        mitte = 0.5*(links + rechts)
+        fm = fl.copy()                                # nur offene auswerten
+        fm[offen] = np.asarray(f(mitte[offen]), float)
+        linke_haelfte = offen & (np.abs(fm - fl) >= np.abs(fr - fm))
+        rechte_haelfte = offen & ~linke_haelfte
+        rechts = np.where(linke_haelfte, mitte, rechts)
+        fr = np.where(linke_haelfte, fm, fr)
+        links = np.where(rechte_haelfte, mitte, links)
+        fl = np.where(rechte_haelfte, fm, fl)
+        aenderung = np.abs(fr - fl)
+        groesste = np.maximum(groesste, aenderung)
+        sprung = aenderung >= 0.5*groesste            # glatte verwerfen
+        links, rechts = links[sprung], rechts[sprung]
+        fl, fr, groesste = fl[sprung], fr[sprung], groesste[sprung]
+    klammern = np.column_stack((links, rechts))
+    return klammern[np.argsort(klammern[:, 0])]
+
+
+def stueckweise(f, a, b, knicke=None, suchen=True, tol=1e-10,
+                methode="kronrod", **suche):
+    """Adaptive Integration eines stueckweise glatten Integranden.
+
+    Das Intervall wird an den bekannten Sprungstellen knicke und (bei
+    suchen=True) an den mit spruenge_suchen() gefundenen zerlegt; jedes
+    Teilstueck wird mit adaptiv() integriert.
+
+    Parameter:
+        f: vektorisierte Funktion
+        a, b: Integrationsgrenzen
+        knicke: bekannte Sprungstellen, Punkte oder Klammern (oder None)
+        suchen: zusaetzlich automatisch nach Spruengen suchen
+        tol: angestrebter absoluter Fehler (anteilig auf die Teilstuecke)
+        methode: Methode fuer adaptiv()
+        suche: weitere Parameter fuer spruenge_suchen()
+    Rueckgabe:
+        wert, fehler, auswertungen: wie bei adaptiv() (inklusive der
+            Auswertungen fuer die Suche)
+        knicke: Liste der verwendeten Sprungstellen
+    """
+    punkte = list(knicke) if knicke is not None else []
+    auswertungen = 0
+    if suchen:
+        zaehler = [0]
+
+        def gezaehlt(x):
+            zaehler[0] += np.size(x)
+            return f(x)
+        punkte.extend(spruenge_suchen(gezaehlt, a, b, **suche))
+        auswertungen += zaehler[0]
+    wert = fehler = 0.0
+    for links, rechts in _teilstuecke(a, b, punkte):
+        teil = adaptiv(f, links, rechts, tol*(rechts - links)/(b - a),
+                       methode)
+        wert += teil[0]
+        fehler += teil[1]
+        auswertungen += teil[2]
+    return wert, fehler, auswertungen, punkte
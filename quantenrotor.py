@@ -0,0 +1,141 @@
+"""Split-Step-FFT-Propagation des quantenmechanischen gekickten Rotors.
+
+Das quantenmechanische Gegenstueck zur Standardabbildung hat den
+Floquet-Operator
+
+    U = exp(-i hquer m^2/2) exp(-i K cos(theta)/hquer),
+
+wobei p = hquer*m der Impuls in der Basis der Impulseigenzustaende m ist.
+Der Kick ist diagonal im Winkelraum, die freie Zeitentwicklung diagonal
+im Impulsraum; zwischen beiden wird per FFT gewechselt, so dass ein Kick
+O(N log N) statt O(N^2) Operationen kostet. Im klassischen Grenzfall
+entspricht das genau der Abbildung aus standardabbildung.py ohne Wickeln
+des Impulses.
+"""
+
+import numpy as np
+from scipy import fft
+
+
+def impulsgitter(N):
+    """Impulsquantenzahlen m in FFT-Reihenfolge.
+
+    Parameter:
+        N: Anzahl der Impulsmoden (gerade)
+    Rueckgabe:
+        m: Array der Laenge N mit den Werten 0, 1, ..., N/2-1, -N/2, ..., -1
+    """
+    return np.fft.fftfreq(N, 1.0/N)
+
+
+def phasen(N, K, hquer):
+    """Diagonale Phasenfaktoren fuer Kick und freie Zeitentwicklung.
+
+    Parameter:
+        N: Anzahl der Moden (= Anzahl der Winkelgitterpunkte)
+        K: Kickstaerke
+        hquer: effektives hquer
+    Rueckgabe:
+        kick: exp(-i K cos(theta)/hquer) auf dem Winkelgitter
+        frei: exp(-i hquer m^2/2) auf dem Impulsgitter
+    """
+    theta = 2*np.pi*np.arange(N)/N                    # Winkelgitter
+    m = impulsgitter(N)
+    kick = np.exp(-1j*K*np.cos(theta)/hquer)
+    frei = np.exp(-0.5j*hquer*m**2)
+    return kick, frei
+
+
+def impulseigenzustand(N, m0=0):
+    """Impulseigenzustaende |m0> als Startwerte.
+
+    Parameter:
+        N: Anzahl der Impulsmoden
+        m0: Impulsquantenzahl (Skalar oder Array der Laenge B)
+    Rueckgabe:
+        psi: Array der Groesse (B, N) in Impulsdarstellung
+    """
+    m0 = np.atleast_1d(m0)
+    psi = np.zeros((len(m0), N), dtype=complex)
+    psi[np.arange(len(m0)), np.asarray(m0) % N] = 1.0
+    return psi
+
+
+def propagiere(psi, K, hquer, kicks, workers=-1):
+    """Propagiere einen Stapel von Zustaenden ueber mehrere Kicks.
+
+    Pro Kick werden eine inverse FFT in den Winkelraum, die Kickphase,
+    eine FFT zurueck in den Impulsraum und die freie Phase angewandt.
+    Alle Zustaende des Stapels werden in einem FFT-Aufruf transformiert;
+    gerechnet wird auf einer Kopie von psi.
+
+    Parameter:
+        psi: Zustaende in Impulsdarstellung, Array der Groesse (B, N)
+            oder (N,)
+        K: Kickstaerke
+        hquer: effektives hquer
+        kicks: Anzahl der Kicks
+        workers: Anzahl der Threads fuer die FFT (-1: alle Kerne)
+    Rueckgabe:
+        psi: Zustaende nach den Kicks, Array der Groesse (B, N)
+        p2: <p^2> nach jedem Kick, Array der Groesse (kicks + 1, B)
+    """
+    psi = np.array(psi, dtype=complex, ndmin=2)
+    N = psi.shape[-1]
+    kick, frei = phasen(N, K, hquer)
+    p2gewicht = (hquer*impulsgitter(N))**2
+    wsk = np.empty(psi.shape)
+
+    p2 = np.empty((kicks + 1, psi.shape[0]))
+    np.abs(psi, out=wsk)
+    p2[0] = (wsk**2).dot(p2gewicht)
+    for n in range(1, kicks + 1):
+        psi = fft.ifft(psi, axis=-1, norm='ortho', overwrite_x=True,
+                       workers=workers)               # Winkelraum
+        psi *= kick
+        psi = fft.fft(psi, axis=-1, norm='ortho', overwrite_x=True,
+                      workers=workers)                # Impulsraum
+        psi *= frei
+        np.abs(psi, out=wsk)
+        wsk *= wsk
+        p2[n] = wsk.dot(p2gewicht)
+    return psi, p2
+
+
+def teilnahmezahl(psi):
+    """Inverse Participation Ratio 1/sum |psi_m|^4 jedes Zustands.
+
+    Parameter:
+        psi: Zustaende in Impulsdarstellung, Array der Groesse (B, N)
+    Rueckgabe:
+        Array der Laenge B; Zahl der effektiv besetzten Impulsmoden
+    """
+    wsk = np.abs(np.atleast_2d(psi))**2
+    return 1.0/np.sum(wsk**2, axis=-1)
+
+
+def lokalisierungslaenge(psi, m0=0, minimum=1e-20):
+    """Lokalisierungslaenge aus dem exponentiellen Abfall |psi_m|^2.
+
+    Fuer dynamisch lokalisierte Zustaende gilt |psi_m|^2 ~ exp(-2|m - m0|/xi).
+    xi wird aus einer Ausgleichsgeraden an log |psi_m|^2 bestimmt, wobei
+    nur Moden oberhalb von minimum beruecksichtigt werden.
+
+    Parameter:
+        psi: Zustaende in Impulsdarstellung, Array der Groesse (B, N)
+        m0: Impulsquantenzahl des Anfangszustands (Skalar oder Array)
+        minimum: kleinste beruecksichtigte Wahrscheinlichkeit
+    Rueckgabe:
+        xi: Array der Laenge B (in Einheiten der Impulsquantenzahl)
+    """
+    psi = np.atleast_2d(psi)
+    m = impulsgitter(psi.shape[-1])
+    abstand = np.abs(m[np.newaxis, :] - np.atleast_1d(m0)[:, np.newaxis])
+    abstand = np.broadcast_to(abstand, psi.shape)
+    xi = np.empty(psi.shape[0])
+    for b in range(psi.shape[0]):
+        wsk = np.abs(psi[b])**2
+        gut = wsk > minimum
+        steigung = np.polyfit(abstand[b, gut], np.log(wsk[gut]), 1)[0]
+        xi[b] = -2.0/steigung
+    return xi
@@ -0,0 +1,832 @@
+"""Vektorisierte Iteration der Standardabbildung des gekickten Rotors.
+
+Die Standardabbildung auf dem Torus [0, 2pi) x [-pi, pi)
+
+    theta_{n+1} = (theta_n + p_n) mod 2pi
+    p_{n+1}     = (p_n + K sin(theta_{n+1}) + pi) mod 2pi - pi
+
+wird hier nicht fuer einen einzelnen Orbit, sondern fuer ein ganzes
+Ensemble von M Anfangsbedingungen gleichzeitig iteriert. Alle Updates
+erfolgen in-place auf NumPy-Arrays, so dass pro Kick nur einige wenige
+Array-Operationen ueber alle Orbits anfallen. Sehr lange Orbits werden
+blockweise erzeugt und koennen direkt reduziert (Histogramm,
+Wiederkehrzeiten) oder in eine Memory-Map geschrieben werden.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+ZWEIPI = 2.0*np.pi
+
+
+def _parameter(K, M):
+    """Bringe einen Abbildungsparameter in Skalar- oder Array-Form.
+
+    Tupel (bei Abbildungen mit mehreren Parametern) werden elementweise
+    behandelt.
+    """
+    if isinstance(K, tuple):
+        return tuple(_parameter(k, M) for k in K)
+    K = np.asarray(K, float)
+    if K.ndim > 0:                                    # K pro Orbit
+        K = np.array(np.broadcast_to(K.ravel(), (M,)))
+    return K
+
+
+def _anfangswerte(theta0, p0, K):
+    """Wandle Startwerte und Kickstaerke in 1D-Arrays gleicher Laenge um.
+
+    Parameter:
+        theta0, p0: Skalare oder Arrays der Startwerte
+        K: Kickstaerke (Skalar oder Array, an die Zahl der Orbits anpassbar)
+            bzw. Tupel solcher Parameter
+    Rueckgabe:
+        t, p: Kopien der Startwerte als float-Arrays der Laenge M
+        K: Kickstaerke als Skalar oder Array der Laenge M (bzw. Tupel)
+    """
+    t, p = np.broadcast_arrays(np.atleast_1d(np.asarray(theta0, float)),
+                               np.atleast_1d(np.asarray(p0, float)))
+    t = np.array(t.ravel())                           # eigene Kopien, damit
+    p = np.array(p.ravel())                           # in-place erlaubt ist
+    return t, p, _parameter(K, len(t))
+
+
+def kick(t, p, K, puffer, wickeln=True):
+    """Fuehre einen Kick der Standardabbildung in-place aus.
+
+    Parameter:
+        t, p: Arrays mit Winkeln und Impulsen (werden ueberschrieben)
+        K: Kickstaerke (Skalar oder Array passender Laenge)
+        puffer: Hilfsarray der Laenge von t fuer sin(theta)
+        wickeln: False laesst den Impuls unbeschraenkt (Zylinder statt
+            Torus), z.B. fuer die Impulsdiffusion
+    """
+    t += p
+    np.remainder(t, ZWEIPI, out=t)                    # Winkel auf [0, 2pi)
+    np.sin(t, out=puffer)
+    puffer *= K
+    p += puffer
+    if wickeln:
+        p += np.pi                                    # Impuls auf [-pi, pi)
+        np.remainder(p, ZWEIPI, out=p)
+        p -= np.pi
+
+
+def _zylinder(t, p, K, puffer):
+    """Kick ohne Wickeln des Impulses (Signatur wie alle Schritte)."""
+    kick(t, p, K, puffer, wickeln=False)
+
+
+def _schritt(schritt, wickeln):
+    """Waehle die Schrittfunktion fuer die Iteratoren aus."""
+    if schritt is not None:
+        return schritt
+    return kick if wickeln else _zylinder
+
+
+def _wickeln(x, puffer, verschiebung=0.0):
+    """Bilde x in-place auf [-verschiebung, 2pi - verschiebung) ab.
+
+    Entspricht np.remainder, kommt aber mit floor und Multiplikationen
+    aus und ist dadurch um ein Vielfaches schneller.
+    """
+    np.add(x, verschiebung, out=puffer)
+    puffer *= 1.0/ZWEIPI
+    np.floor(puffer, out=puffer)
+    puffer *= ZWEIPI
+    x -= puffer
+
+
+def kick_tangential(t, p, dt, dp, K, sinus, cosinus, hilf):
+    """Fuehre einen Kick samt Tangentialabbildung in-place aus.
+
+    Die Linearisierung der Standardabbildung lautet
+        dt' = dt + dp
+        dp' = dp + K cos(theta') dt'
+    und wird fuer den Lyapunov-Exponenten mitgefuehrt. Der Kosinus wird
+    aus dem Sinus ueber |cos| = sqrt(1 - sin^2) und das Vorzeichen des
+    Quadranten gewonnen, so dass pro Kick nur eine Winkelfunktion
+    ausgewertet wird.
+
+    Parameter:
+        t, p: Arrays mit Winkeln und Impulsen (werden ueberschrieben)
+        dt, dp: Komponenten des Tangentialvektors (werden ueberschrieben)
+        K: Kickstaerke (Skalar oder Array passender Laenge)
+        sinus, cosinus, hilf: Hilfsarrays der Laenge von t
+    """
+    t += p
+    _wickeln(t, hilf)                                 # Winkel auf [0, 2pi)
+    dt += dp
+    np.sin(t, out=sinus)
+    np.multiply(sinus, sinus, out=cosinus)            # |cos| = sqrt(1-sin^2)
+    np.subtract(1.0, cosinus, out=cosinus)
+    np.maximum(cosinus, 0.0, out=cosinus)
+    np.sqrt(cosinus, out=cosinus)
+    np.subtract(t, np.pi, out=hilf)                   # cos >= 0 fuer
+    np.abs(hilf, out=hilf)                            # |theta - pi| >= pi/2
+    hilf -= 0.5*np.pi
+    np.copysign(cosinus, hilf, out=cosinus)
+    cosinus *= K                                      # dp' = dp + K cos dt'
+    cosinus *= dt
+    dp += cosinus
+    sinus *= K                                        # p' = p + K sin
+    p += sinus
+    _wickeln(p, hilf, np.pi)                          # Impuls auf [-pi, pi)
+
+
+def _block_skalar(tblock, pblock, zustand, K, erste, wickeln=True):
+    """Fuelle einen Block fuer einen einzelnen Orbit mit skalarer Iteration.
+
+    Fuer M = 1 ist eine Python-Schleife mit math.sin deutlich schneller
+    als mehrere NumPy-Aufrufe auf Arrays der Laenge 1.
+
+    Parameter:
+        tblock, pblock: Arrays der Groesse (L, 1), werden ueberschrieben
+        zustand: Liste [theta, p] mit dem aktuellen Zustand (wird veraendert)
+        K: Kickstaerke (Skalar)
+        erste: True, falls die erste Zeile der Startwert ohne Kick ist
+        wickeln: wie bei kick()
+    """
+    t, p = zustand
+    K = float(K)
+    tz = []
+    pz = []
+    for i in range(len(tblock)):
+        if not erste:
+            t = (t + p) % ZWEIPI
+            p = p + K*math.sin(t)
+            if wickeln:
+                p = (p + math.pi) % ZWEIPI - math.pi
+        erste = False
+        tz.append(t)
+        pz.append(p)
+    tblock[:, 0] = tz
+    pblock[:, 0] = pz
+    zustand[:] = [t, p]
+
+
+def positions_chunks(theta0, p0, n=1000, K=2.6, chunk=1000, wickeln=True,
+                     schritt=None):
+    """Iteriere ein Ensemble von Orbits blockweise.
+
+    Der Speicherbedarf ist durch chunk*M begrenzt und haengt nicht von
+    der Orbitlaenge n ab; mit n=None laeuft der Generator unbegrenzt.
+
+    Parameter:
+        theta0, p0: Startwerte (Skalare oder Arrays der Laenge M)
+        n: Anzahl der Punkte pro Orbit (inklusive Startwert) oder None
+        K: Kickstaerke (Skalar oder Array der Laenge M)
+        chunk: maximale Anzahl Zeilen pro Block
+        wickeln: False laesst den Impuls unbeschraenkt (siehe kick)
+        schritt: andere flaechentreue Abbildung schritt(x, y, K, puffer),
+            die in-place arbeitet (siehe abbildungen.py); K ist dann
+            deren Parameter. Default: Standardabbildung (kick)
+    Rueckgabe:
+        Generator, der Bloecke (t, p) der Groesse (<= chunk, M) liefert.
+        Die Bloecke teilen sich denselben Speicher und werden beim
+        naechsten Schritt ueberschrieben; wer sie aufheben will, muss
+        sie kopieren.
+    """
+    t, p, K = _anfangswerte(theta0, p0, K)
+    M = len(t)
+    if n is not None:
+        chunk = min(chunk, n)
+    chunk = max(1, chunk)
+    tblock = np.empty((chunk, M))
+    pblock = np.empty((chunk, M))
+    puffer = np.empty(M)
+    skalar = (schritt is None and M == 1 and np.ndim(K) == 0)
+    schritt = _schritt(schritt, wickeln)
+    zustand = [float(t[0]), float(p[0])] if skalar else None
+
+    erste = True
+    rest = n
+    while rest is None or rest > 0:
+        laenge = chunk if rest is None else min(chunk, rest)
+        if skalar:
+            _block_skalar(tblock[:laenge], pblock[:laenge], zustand, K,
+                          erste, wickeln)
+            erste = False
+        else:
+            for i in range(laenge):
+                if erste:                             # Startwert ohne Kick
+                    erste = False
+                else:
+                    schritt(t, p, K, puffer)
+                tblock[i] = t
+                pblock[i] = p
+        if rest is not None:
+            rest -= laenge
+        yield tblock[:laenge], pblock[:laenge]
+
+
+def orbit_speichern(dateiname, theta0, p0, n, K=2.6, chunk=2**16):
+    """Schreibe n Punkte eines Ensembles blockweise in eine .npy-Datei.
+
+    Die Datei wird als Memory-Map angelegt, so dass auch Orbits, die
+    nicht in den Arbeitsspeicher passen, erzeugt werden koennen.
+
+    Parameter:
+        dateiname: Pfad der anzulegenden .npy-Datei
+        theta0, p0, n, K, chunk: wie bei positions_chunks
+    Rueckgabe:
+        daten: Memory-Map der Groesse (2, n, M) mit daten[0] = theta
+            und daten[1] = p
+    """
+    M = len(_anfangswerte(theta0, p0, K)[0])
+    daten = np.lib.format.open_memmap(dateiname, mode='w+', dtype=float,
+                                      shape=(2, n, M))
+    zeile = 0
+    for tb, pb in positions_chunks(theta0, p0, n, K, chunk):
+        daten[0, zeile:zeile + len(tb)] = tb
+        daten[1, zeile:zeile + len(pb)] = pb
+        zeile += len(tb)
+        daten.flush()                                 # Block auf Platte
+    return daten
+
+
+def wiederkehrzeiten(bloecke, bereich, maxzeit=10**4):
+    """Histogramm der Wiederkehrzeiten in einen Phasenraumbereich.
+
+    Gezaehlt werden die Abstaende (in Kicks) zwischen zwei aufeinander
+    folgenden Besuchen jedes Orbits im Rechteck bereich. Die Bloecke
+    werden nur einmal durchlaufen, Besuche ueber Blockgrenzen hinweg
+    werden korrekt verbunden.
+
+    Parameter:
+        bloecke: Iterator ueber Bloecke (t, p), z.B. aus positions_chunks
+        bereich: (theta_min, theta_max, p_min, p_max)
+        maxzeit: groesste aufgeloeste Wiederkehrzeit; laengere Zeiten
+            werden im letzten Eintrag gesammelt
+    Rueckgabe:
+        hist: Array der Laenge maxzeit + 1, hist[k] = Anzahl der
+            Wiederkehrzeiten k (hist[maxzeit]: alle Zeiten >= maxzeit)
+    """
+    tmin, tmax, pmin, pmax = bereich
+    hist = np.zeros(maxzeit + 1, dtype=np.int64)
+    letzter = None                                    # letzter Besuch
+    offset = 0
+    for tb, pb in bloecke:
+        if letzter is None:
+            letzter = np.full(tb.shape[1], -1, dtype=np.int64)
+        drin = (tb >= tmin) & (tb < tmax) & (pb >= pmin) & (pb < pmax)
+        orbit, zeit = np.nonzero(drin.T)              # nach Orbit sortiert
+        zeit = zeit + offset
+        if len(zeit):
+            neu = np.ones(len(zeit), dtype=bool)      # erster Besuch im
+            neu[1:] = orbit[1:] != orbit[:-1]         # Block je Orbit
+            vorher = np.empty_like(zeit)
+            vorher[1:] = zeit[:-1]
+            vorher[neu] = letzter[orbit[neu]]
+            gueltig = vorher >= 0
+            dt = np.minimum(zeit[gueltig] - vorher[gueltig], maxzeit)
+            hist += np.bincount(dt, minlength=maxzeit + 1)
+            ende = np.ones(len(zeit), dtype=bool)     # letzter Besuch im
+            ende[:-1] = neu[1:]                       # Block je Orbit
+            letzter[orbit[ende]] = zeit[ende]
+        offset += len(tb)
+    return hist
+
+
+def positions_batch(theta0, p0, n=1000, K=2.6, wickeln=True, schritt=None):
+    """Berechne n Punkte der Standardabbildung fuer M Orbits gleichzeitig.
+
+    Parameter:
+        theta0, p0: Startwerte (Skalare oder Arrays der Laenge M)
+        n: Anzahl der Punkte pro Orbit (inklusive Startwert)
+        K: Kickstaerke (Skalar oder Array der Laenge M)
+        wickeln: False laesst den Impuls unbeschraenkt (siehe kick)
+        schritt: andere Abbildung wie bei positions_chunks
+    Rueckgabe:
+        t, p: Arrays der Groesse (n, M); Spalte j ist der Orbit zum
+            Startwert (theta0[j], p0[j]).
+    """
+    t, p, K = _anfangswerte(theta0, p0, K)
+    M = len(t)
+    tout = np.empty((n, M))
+    pout = np.empty((n, M))
+    puffer = np.empty(M)
+    if schritt is None and M == 1 and np.ndim(K) == 0 and n > 0:
+        _block_skalar(tout, pout, [float(t[0]), float(p[0])], K, True,
+                      wickeln)                        # einzelner Orbit
+        return tout, pout
+    schritt = _schritt(schritt, wickeln)
+
+    if n > 0:
+        tout[0] = t
+        pout[0] = p
+    for i in range(1, n):                             # n-1 Kicks
+        schritt(t, p, K, puffer)
+        tout[i] = t
+        pout[i] = p
+    return tout, pout
+
+
+def orbit_cache_anlegen(budget=256*2**20, aufloesung=1e-6):
+    """Lege einen leeren LRU-Cache fuer einzelne Orbits an.
+
+    Parameter:
+        budget: maximaler Speicher aller gespeicherten Orbits in Byte
+        aufloesung: Rasterweite, auf die Startwerte gerundet werden;
+            Klicks innerhalb einer Rasterzelle teilen sich einen Orbit
+    Rueckgabe:
+        cache: Dictionary mit den Eintraegen und der Buchfuehrung; der
+            Zugriff ueber orbit_gecacht ist threadsicher
+    """
+    return {"eintraege": OrderedDict(), "budget": budget, "belegt": 0,
+            "aufloesung": aufloesung, "sperre": threading.Lock()}
+
+
+def orbit_gecacht(cache, theta0, p0, n=1000, K=2.6):
+    """Orbit wie positions_batch fuer einen Startwert, mit Zwischenspeicher.
+
+    Der Startwert wird auf das Raster des Caches gerundet. Ist zum
+    Schluessel (theta0, p0, K) bereits ein Orbit der Laenge m >= n
+    gespeichert, wird dessen Anfang zurueckgegeben; ist er kuerzer,
+    wird er vom letzten Punkt aus um n - m Punkte fortgesetzt statt
+    neu berechnet. Zuletzt nicht benutzte Orbits werden verdraengt,
+    sobald das Speicherbudget ueberschritten ist.
+
+    Parameter:
+        cache: Cache aus orbit_cache_anlegen (wird veraendert)
+        theta0, p0: Startwert (Skalare)
+        n: Anzahl der Punkte (inklusive Startwert)
+        K: Kickstaerke
+    Rueckgabe:
+        t, p: Arrays der Laenge n (Sichten auf den Cache, nicht veraendern)
+    """
+    q = cache["aufloesung"]
+    i, j = int(round(theta0/q)), int(round(p0/q))
+    schluessel = (i, j, float(K))
+    eintraege = cache["eintraege"]
+
+    with cache["sperre"]:                             # gerechnet wird
+        eintrag = eintraege.pop(schluessel, None)     # ausserhalb der Sperre
+        if eintrag is not None:
+            cache["belegt"] -= eintrag[0].nbytes + eintrag[1].nbytes
+
+    if eintrag is not None:
+        t, p = eintrag
+        m = len(t)
+        if m < n:                                     # vom Ende fortsetzen
+            tneu, pneu = positions_batch(t[-1], p[-1], n - m + 1, K)
+            t = np.concatenate((t, tneu[1:, 0]))
+            p = np.concatenate((p, pneu[1:, 0]))
+    else:
+        t, p = positions_batch(i*q, j*q, n, K)
+        t, p = t[:, 0], p[:, 0]
+
+    groesse = t.nbytes + p.nbytes
+    with cache["sperre"]:
+        if groesse <= cache["budget"] and schluessel not in eintraege:
+            while cache["belegt"] + groesse > cache["budget"]:
+                talt, palt = eintraege.popitem(last=False)[1]  # LRU raus
+                cache["belegt"] -= talt.nbytes + palt.nbytes
+            eintraege[schluessel] = (t, p)            # zuletzt benutzt
+            cache["belegt"] += groesse
+    return t[:n], p[:n]
+
+
+def dichte_anlegen(nbins=512):
+    """Lege ein leeres Phasenraum-Histogramm auf dem Torus an.
+
+    Parameter:
+        nbins: Aufloesung (Skalar fuer quadratisches Raster oder Paar
+            (n_winkel, n_impuls))
+    Rueckgabe:
+        H: Zaehl-Array der Groesse (n_impuls, n_winkel), Zeile = Impuls
+    """
+    nwinkel, nimpuls = np.broadcast_to(nbins, (2,))
+    return np.zeros((int(nimpuls), int(nwinkel)), dtype=np.int64)
+
+
+def dichte_hinzufuegen(H, t, p, chunk=2**22, bereich=None):
+    """Sortiere Phasenraumpunkte in-place in das Histogramm H ein.
+
+    Der Aufwand ist linear in der Zahl der neuen Punkte und haengt nicht
+    davon ab, wie viele Punkte H bereits enthaelt.
+
+    Parameter:
+        H: Histogramm aus dichte_anlegen (wird veraendert)
+        t, p: Arrays beliebiger, gleicher Form mit Winkeln und Impulsen
+        chunk: maximale Zahl gleichzeitig verarbeiteter Punkte
+        bereich: (theta_min, theta_max, p_min, p_max) eines Ausschnitts,
+            auf den sich H bezieht; Punkte ausserhalb werden verworfen.
+            Ohne Angabe deckt H den ganzen Torus ab.
+    Rueckgabe:
+        H
+    """
+    nimpuls, nwinkel = H.shape
+    t = np.ravel(t)
+    p = np.ravel(p)
+    flach = H.reshape(-1)                             # Sicht auf H
+    for start in range(0, len(t), chunk):
+        tb = t[start:start + chunk]
+        pb = p[start:start + chunk]
+        if bereich is None:
+            i = (np.remainder(tb, ZWEIPI)*(nwinkel/ZWEIPI)).astype(np.intp)
+            j = (np.remainder(pb + np.pi, ZWEIPI)*(nimpuls/ZWEIPI)
+                 ).astype(np.intp)
+            np.minimum(i, nwinkel - 1, out=i)         # Rundung bei 2pi
+            np.minimum(j, nimpuls - 1, out=j)
+        else:
+            tmin, tmax, pmin, pmax = bereich
+            i = np.floor((tb - tmin)*(nwinkel/(tmax - tmin))).astype(np.intp)
+            j = np.floor((pb - pmin)*(nimpuls/(pmax - pmin))).astype(np.intp)
+            drin = (i >= 0) & (i < nwinkel) & (j >= 0) & (j < nimpuls)
+            i = i[drin]
+            j = j[drin]
+        flach += np.bincount(j*nwinkel + i, minlength=flach.size)
+    return H
+
+
+def startgitter(bereich, stufe):
+    """Startwerte einer Verfeinerungsstufe im Ausschnitt bereich.
+
+    Stufe k liefert die Mitten eines 2^k x 2^k Gitters. Die Mitten
+    verschiedener Stufen fallen nie zusammen, so dass aufeinander
+    folgende Stufen das Bild von grob nach fein verdichten.
+
+    Parameter:
+        bereich: (theta_min, theta_max, p_min, p_max)
+        stufe: Verfeinerungsstufe k >= 0
+    Rueckgabe:
+        theta0, p0: Arrays der Laenge 4^k
+    """
+    tmin, tmax, pmin, pmax = bereich
+    s = (np.arange(2**stufe) + 0.5)/2**stufe
+    T, P = np.meshgrid(tmin + (tmax - tmin)*s, pmin + (pmax - pmin)*s)
+    return T.ravel(), P.ravel()
+
+
+def dichte_zeichnen(ax, H, cmap='gray_r', bereich=None, aspect=None):
+    """Stelle das Histogramm H als einzelnes Bild im Plotbereich ax dar.
+
+    Parameter:
+        ax: Matplotlib-Achsen
+        H: Histogramm aus dichte_anlegen
+        cmap: Farbtabelle
+        bereich: Ausschnitt wie bei dichte_hinzufuegen (Default: Torus)
+        aspect: Seitenverhaeltnis des Bildes (Default: das der Achsen,
+            so dass z.B. subplot(111, aspect=1.0) erhalten bleibt)
+    Rueckgabe:
+        bild: AxesImage, das mit dichte_aktualisieren erneuert wird
+    """
+    if bereich is None:
+        bereich = (0.0, ZWEIPI, -np.pi, np.pi)
+    if aspect is None:
+        aspect = ax.get_aspect()
+    bild = ax.imshow(np.log1p(H), origin='lower', cmap=cmap,
+                     extent=list(bereich), aspect=aspect,
+                     interpolation='nearest')
+    bild.set_clim(0.0, 1.0)
+    return bild
+
+
+def dichte_aktualisieren(bild, H, bereich=None):
+    """Uebertrage den aktuellen Inhalt von H in das Bild (ohne Neuzeichnen).
+
+    Parameter:
+        bild: AxesImage aus dichte_zeichnen
+        H: Histogramm aus dichte_anlegen
+        bereich: neuer Ausschnitt des Bildes (Default: unveraendert)
+    """
+    daten = np.log1p(H)                               # logarithmische Skala
+    bild.set_data(daten)
+    bild.set_clim(0.0, max(1.0, daten.max()))
+    if bereich is not None:
+        bild.set_extent(list(bereich))
+
+
+def lyapunov_batch(theta0, p0, n=1000, K=2.6, chunk=2**16):
+    """Maximaler Lyapunov-Exponent und Fast Lyapunov Indicator.
+
+    Fuer jeden Startwert wird der Tangentialvektor ueber n Kicks
+    mititeriert und in jedem Schritt renormiert. Die Orbits werden in
+    Paketen der Groesse chunk bearbeitet, damit alle Hilfsarrays im
+    Cache bleiben.
+
+    Parameter:
+        theta0, p0: Startwerte (Skalare oder Arrays der Laenge M)
+        n: Anzahl der Kicks
+        K: Kickstaerke (Skalar oder Array der Laenge M)
+        chunk: Anzahl gleichzeitig iterierter Orbits
+    Rueckgabe:
+        lam: Lyapunov-Exponenten (Array der Laenge M)
+        fli: Fast Lyapunov Indicator max_k log|v_k| (Array der Laenge M)
+    """
+    t, p, K = _anfangswerte(theta0, p0, K)
+    M = len(t)
+    lam = np.empty(M)
+    fli = np.empty(M)
+    for start in range(0, M, chunk):
+        sl = slice(start, start + chunk)
+        tc, pc = t[sl], p[sl]
+        Kc = K[sl] if np.ndim(K) else K
+        m = len(tc)
+        dt = np.full(m, np.sqrt(0.5))                 # Tangentialvektor
+        dp = np.full(m, np.sqrt(0.5))
+        summe = np.zeros(m)                           # Summe log|v|
+        maximum = np.zeros(m)
+        sinus = np.empty(m)
+        cosinus = np.empty(m)
+        hilf = np.empty(m)
+        for i in range(n):
+            kick_tangential(tc, pc, dt, dp, Kc, sinus, cosinus, hilf)
+            np.multiply(dt, dt, out=sinus)            # |v| ohne hypot
+            np.multiply(dp, dp, out=cosinus)
+            sinus += cosinus
+            np.sqrt(sinus, out=sinus)
+            dt /= sinus                               # Renormierung
+            dp /= sinus
+            np.log(sinus, out=sinus)
+            summe += sinus
+            np.maximum(maximum, summe, out=maximum)
+        lam[sl] = summe/max(n, 1)
+        fli[sl] = maximum
+    return lam, fli
+
+
+def chaoskarte(nbins=2000, n=200, K=2.6, schwelle=None, chunk=2**16):
+    """Klassifiziere ein Gitter von Startwerten in regulaer und chaotisch.
+
+    Parameter:
+        nbins: Aufloesung (Skalar oder Paar (n_winkel, n_impuls))
+        n: Anzahl der Kicks pro Startwert
+        K: Kickstaerke
+        schwelle: Grenze fuer den Lyapunov-Exponenten; ohne Angabe
+            3 log(n)/n, was regulaere Orbits (Wachstum ~ n) sicher
+            unterschreiten
+        chunk: Anzahl gleichzeitig iterierter Orbits
+    Rueckgabe:
+        lam: Lyapunov-Exponenten als Bild der Groesse (n_impuls, n_winkel),
+            passend zu dichte_zeichnen
+        chaotisch: boolsches Bild derselben Groesse
+    """
+    nwinkel, nimpuls = np.broadcast_to(nbins, (2,))
+    theta = (np.arange(nwinkel) + 0.5)*(ZWEIPI/nwinkel)   # Zellmitten
+    p = (np.arange(nimpuls) + 0.5)*(ZWEIPI/nimpuls) - np.pi
+    T, P = np.meshgrid(theta, p)
+    lam, fli = lyapunov_batch(T, P, n, K, chunk)
+    lam = lam.reshape(T.shape)
+    if schwelle is None:
+        schwelle = 3.0*np.log(max(n, 2))/max(n, 2)
+    return lam, lam > schwelle
+
+
+def _abbildung_q(t, p, K, q):
+    """Iteriere die ungewickelte Standardabbildung q-mal samt Jacobi-Matrix.
+
+    Ohne Modulo-Operation ist die Abbildung glatt, so dass die Jacobi-
+    Matrix J = A_q ... A_1 mit A = [[1, 1], [K cos, 1 + K cos]] exakt ist.
+
+    Parameter:
+        t, p: Arrays der Startwerte
+        K: Kickstaerke (Skalar oder Array passender Laenge)
+        q: Anzahl der Iterationen
+    Rueckgabe:
+        t, p: Bilder nach q Kicks (nicht gewickelt)
+        a, b, c, d: Eintraege der Jacobi-Matrix [[a, b], [c, d]]
+    """
+    t = np.array(t, float)
+    p = np.array(p, float)
+    a = np.ones_like(t)
+    b = np.zeros_like(t)
+    c = np.zeros_like(t)
+    d = np.ones_like(t)
+    for i in range(q):
+        t += p
+        kc = K*np.cos(t)
+        p += K*np.sin(t)
+        a += c                                        # erste Zeile [1, 1]
+        b += d
+        c += kc*a                                     # zweite Zeile
+        d += kc*b                                     # [Kc, 1 + Kc]
+    return t, p, a, b, c, d
+
+
+def _rest(x):
+    """Wickle Differenzen auf [-pi, pi)."""
+    return np.remainder(x + np.pi, ZWEIPI) - np.pi
+
+
+def periodische_orbits(q, K=2.6, startwerte=64, iterationen=50, tol=1e-10,
+                       genauigkeit=1e-6):
+    """Finde Punkte der Periode q mit einem Mehrfachstart-Newton-Verfahren.
+
+    Geloest wird M^q(x) = x (modulo 2pi) gleichzeitig fuer ein Gitter von
+    startwerte^2 Startpunkten und alle K-Werte. Konvergierte Loesungen mit
+    kleinerer Minimalperiode werden verworfen, mehrfach gefundene Punkte
+    zusammengefasst. Die Stabilitaet wird ueber Greenes Residuum
+    R = (2 - Spur J)/4 angegeben: 0 < R < 1 elliptisch (Inselzentrum),
+    R < 0 hyperbolisch, R > 1 invers hyperbolisch.
+
+    Parameter:
+        q: Periode
+        K: Kickstaerke (Skalar oder Liste/Array von Kickstaerken)
+        startwerte: Startpunkte pro Richtung und K-Wert
+        iterationen: maximale Anzahl der Newton-Schritte
+        tol: Toleranz fuer das Residuum |M^q(x) - x|
+        genauigkeit: Rasterweite, unterhalb derer Punkte als gleich gelten
+    Rueckgabe:
+        K, theta, p, R: Arrays gleicher Laenge mit einer Zeile pro
+            gefundenem periodischen Punkt
+    """
+    T0, P0 = startgitter((0.0, ZWEIPI, -np.pi, np.pi),
+                         int(np.ceil(np.log2(startwerte))))
+    Kwerte = np.atleast_1d(np.asarray(K, float))
+    t = np.tile(T0, len(Kwerte))                      # alle K auf einmal
+    p = np.tile(P0, len(Kwerte))
+    Kv = np.repeat(Kwerte, len(T0))
+
+    for i in range(iterationen):
+        tq, pq, a, b, c, d = _abbildung_q(t, p, Kv, q)
+        r1 = _rest(tq - t)
+        r2 = _rest(pq - p)
+        det = (a - 1)*(d - 1) - b*c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt = (-(d - 1)*r1 + b*r2)/det             # (J - I) dx = -r
+            dp = (c*r1 - (a - 1)*r2)/det
+        schritt = np.hypot(dt, dp)
+        faktor = np.minimum(1.0, 1.0/np.maximum(schritt, 1e-300))
+        faktor[~np.isfinite(schritt)] = 0.0           # singulaer: stehen
+        dt[~np.isfinite(dt)] = 0.0
+        dp[~np.isfinite(dp)] = 0.0
+        t += faktor*dt                                # Schritt begrenzt
+        p += faktor*dp
+
+    tq, pq, a, b, c, d = _abbildung_q(t, p, Kv, q)
+    ok = np.hypot(_rest(tq - t), _rest(pq - p)) < tol
+    for teiler in range(1, q):                        # Minimalperiode q
+        if q % teiler == 0:
+            tt, pt = _abbildung_q(t, p, Kv, teiler)[:2]
+            ok &= np.hypot(_rest(tt - t), _rest(pt - p)) > 1e3*tol
+
+    t = np.remainder(t[ok], ZWEIPI)
+    p = _rest(p[ok])
+    t[t > ZWEIPI - genauigkeit] -= ZWEIPI             # 2pi und 0 bzw. pi
+    p[p > np.pi - genauigkeit] -= ZWEIPI              # und -pi gleichsetzen
+    Kv = Kv[ok]
+    R = (2.0 - (a[ok] + d[ok]))/4.0
+    schluessel = np.column_stack((Kv, np.round(t/genauigkeit),
+                                  np.round(p/genauigkeit)))
+    _, index = np.unique(schluessel, axis=0, return_index=True)
+    return Kv[index], t[index], p[index], R[index]
+
+
+def stabilitaet(R):
+    """Klassifiziere periodische Punkte nach Greenes Residuum.
+
+    Parameter:
+        R: Array von Residuen aus periodische_orbits
+    Rueckgabe:
+        Array von Strings 'elliptisch', 'hyperbolisch' oder
+        'invers hyperbolisch'
+    """
+    R = np.asarray(R)
+    return np.where(R < 0, 'hyperbolisch',
+                    np.where(R > 1, 'invers hyperbolisch', 'elliptisch'))
+
+
+def impulsdiffusion(K=2.6, teilchen=10**6, kicks=1000, chunk=2**16,
+                    seed=None):
+    """Mittleres Impulsquadrat <(p_n - p_0)^2> des ungewickelten Rotors.
+
+    Die Teilchen starten mit p_0 = 0 und gleichverteilten Winkeln. Die
+    Momente werden waehrend der Iteration paketweise aufsummiert, so
+    dass keine Trajektorien gespeichert werden muessen.
+
+    Parameter:
+        K: Kickstaerke
+        teilchen: Groesse des Ensembles
+        kicks: Anzahl der Kicks
+        chunk: Anzahl gleichzeitig iterierter Teilchen
+        seed: Startwert des Zufallsgenerators
+    Rueckgabe:
+        p2: <(p_n - p_0)^2> fuer n = 0 ... kicks
+        fehler: Standardfehler von p2
+    """
+    zufall = np.random.RandomState(seed)
+    summe = np.zeros(kicks + 1)                       # Summe dp^2
+    summe2 = np.zeros(kicks + 1)                      # Summe dp^4
+    for start in range(0, teilchen, chunk):
+        m = min(chunk, teilchen - start)
+        t = zufall.uniform(0.0, ZWEIPI, m)
+        p = np.zeros(m)
+        puffer = np.empty(m)
+        quadrat = np.empty(m)
+        for n in range(1, kicks + 1):
+            kick(t, p, K, puffer, wickeln=False)
+            np.multiply(p, p, out=quadrat)
+            summe[n] += quadrat.sum()
+            summe2[n] += np.dot(quadrat, quadrat)
+    p2 = summe/teilchen
+    varianz = np.maximum(summe2/teilchen - p2**2, 0.0)
+    return p2, np.sqrt(varianz/teilchen)
+
+
+def diffusionskoeffizient(K_werte, teilchen=10**6, kicks=1000, anfang=None,
+                          chunk=2**16, seed=None):
+    """Diffusionskoeffizient D(K) = <(p_n - p_0)^2>/(2n) fuer viele K.
+
+    D wird aus der Steigung einer Ausgleichsgeraden an <(p_n - p_0)^2>
+    bestimmt; die ersten Kicks (Default: ein Zehntel) werden dabei
+    ausgelassen, da dort noch Korrelationen den Anstieg verfaelschen.
+    Im quasilinearen Grenzfall grosser K gilt D ~ K^2/4.
+
+    Parameter:
+        K_werte: Liste oder Array der Kickstaerken
+        teilchen, kicks, chunk, seed: wie bei impulsdiffusion
+        anfang: erster Kick, der in die Ausgleichsgerade eingeht
+    Rueckgabe:
+        D: Array der Diffusionskoeffizienten, gleiche Laenge wie K_werte
+    """
+    if anfang is None:
+        anfang = kicks//10
+    n = np.arange(anfang, kicks + 1)
+    D = []
+    for K in np.atleast_1d(K_werte):
+        p2 = impulsdiffusion(K, teilchen, kicks, chunk, seed)[0]
+        D.append(np.polyfit(n, p2[anfang:], 1)[0]/2.0)
+    return np.array(D)
+
+
+def _birkhoff_gewichte(n):
+    """Normierte Gewichte exp(-1/(s(1-s))) des gewichteten Birkhoff-Mittels.
+
+    Fuer quasiperiodische Orbits konvergiert das gewichtete Mittel
+    schneller als jede Potenz von 1/n, fuer chaotische nur wie 1/sqrt(n).
+    """
+    s = (np.arange(n) + 0.5)/n
+    w = np.exp(-1.0/(s*(1.0 - s)))
+    return w/w.sum()
+
+
+def frequenzanalyse(theta0, p0, n=1000, K=2.6, chunk=2**16):
+    """Rotationszahl und Frequenzdrift fuer viele Startwerte.
+
+    Die Orbits werden auf dem Zylinder (ungewickelter Impuls) iteriert,
+    die Rotationszahl ist dann das Mittel von p/2pi. Sie wird getrennt
+    fuer die erste und zweite Haelfte der n Kicks als gewichtetes
+    Birkhoff-Mittel bestimmt; die Differenz beider Werte ist auf KAM-Tori
+    winzig (~ Rechengenauigkeit) und in chaotischen Gebieten gross.
+    Orbits in Inseln um einen periodischen Punkt haben die rationale
+    Rotationszahl der Insel. Trajektorien werden nicht gespeichert.
+
+    Parameter:
+        theta0, p0: Startwerte (Skalare oder Arrays der Laenge M)
+        n: Anzahl der Kicks (gerade)
+        K: Kickstaerke (Skalar oder Array der Laenge M)
+        chunk: Anzahl gleichzeitig iterierter Orbits
+    Rueckgabe:
+        omega: Rotationszahl der ersten Haelfte (Array der Laenge M)
+        drift: |omega_2 - omega_1| (Array der Laenge M)
+    """
+    t, p, K = _anfangswerte(theta0, p0, K)
+    M = len(t)
+    haelfte = n//2
+    w = _birkhoff_gewichte(haelfte)/ZWEIPI
+    omega = np.empty((2, M))
+    for start in range(0, M, chunk):
+        sl = slice(start, start + chunk)
+        tc, pc = t[sl], p[sl]
+        Kc = K[sl] if np.ndim(K) else K
+        m = len(tc)
+        puffer = np.empty(m)
+        for h in range(2):
+            summe = np.zeros(m)
+            for i in range(haelfte):                  # kick() ohne Wickeln,
+                tc += pc                              # Winkel per floor
+                _wickeln(tc, puffer)
+                np.sin(tc, out=puffer)
+                puffer *= Kc
+                pc += puffer
+                np.multiply(pc, w[i], out=puffer)     # theta-Zuwachs ist p
+                summe += puffer
+            omega[h, sl] = summe
+    return omega[0], np.abs(omega[1] - omega[0])
+
+
+def frequenzkarte(nbins=1000, n=1000, K=2.6, chunk=2**16):
+    """Frequenzanalyse auf einem regelmaessigen Gitter von Startwerten.
+
+    Parameter:
+        nbins: Aufloesung (Skalar oder Paar (n_winkel, n_impuls))
+        n: Anzahl der Kicks pro Startwert
+        K: Kickstaerke
+        chunk: Anzahl gleichzeitig iterierter Orbits
+    Rueckgabe:
+        omega: Rotationszahlen als Bild der Groesse (n_impuls, n_winkel)
+        diffusion: log10 der Frequenzdrift als Bild derselben Groesse;
+            Werte um -10 und darunter kennzeichnen regulaere Orbits
+    """
+    nwinkel, nimpuls = np.broadcast_to(nbins, (2,))
+    T, P = np.meshgrid((np.arange(nwinkel) + 0.5)*(ZWEIPI/nwinkel),
+                       (np.arange(nimpuls) + 0.5)*(ZWEIPI/nimpuls) - np.pi)
+    omega, drift = frequenzanalyse(T, P, n, K, chunk)
+    diffusion = np.log10(np.maximum(drift, 1e-16))
+    return omega.reshape(T.shape), diffusion.reshape(T.shape)
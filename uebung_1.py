@@ -5,55 +5,72 @@ bereit und gibt die Moeglichkeit im Phasenraum-Diagramm mit Linksklick
 die Startbedingungen zu waehlen. 
 """
 
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
+from standardabbildung import (positions_batch, dichte_anlegen,
+                               dichte_hinzufuegen, dichte_zeichnen,
+                               dichte_aktualisieren, orbit_cache_anlegen,
+                               orbit_gecacht)
+from ansicht import verfeinerung_verbinden, klick_verteiler
 
 
-def positions(theta_0, p_0, n=1000):
+def positions(theta_0, p_0, n=1000, K=2.6):
     """
     Dieses Programm bildet die Standardabbildung des gekickten Rotors 
     auf dem Torus und gibt die Werte theta und p als Arrays zurueck.
+    Die Iteration selbst uebernimmt positions_batch mit einem Orbit.
     """
-    t = np.zeros(n);                 # Koordinaten-Array mit Start-
-    p = np.zeros(n);                 # werten anlegen
-    t[0] = theta_0
-    p[0] = p_0 
-    
-    for i in np.arange(1,n):         # n Werte iterativ bestimmen
-        t[i] = ((t[i-1] + p[i-1]) % (2 * np.pi))
-        p[i] = ((p[i-1]+K*np.sin(t[i])) + np.pi) % (2*np.pi) - np.pi
-    return t, p
+    t, p = positions_batch(theta_0, p_0, n, K)
+    return t[:, 0], p[:, 0]
 
 
-def mouse_click(event):
-    """Diese Funktion uebernimmt die Koordinaten im Diagramm bei
-    Linksklick und plottet von diesen Werten ausgehend 1000 Punkte 
-    des gekickten Rotors
+def orbit_dichte(x, y, abgebrochen, K=2.6, n=1000, cache=None, nbins=512):
+    """Arbeiter-Thread des Klick-Verteilers: Orbit zum Klick berechnen
+    und als eigenes Teil-Histogramm zurueckgeben.
     """
-    mode = plt.get_current_fig_manager().toolbar.mode
-    # Prueft ob Zoom deaktiviert ist und ob mit links geklickt wird
-    if event.button == 1 and event.inaxes and mode == '':
-            x, y = positions(event.xdata, event.ydata)
-            plt.plot(x, y,linestyle="none", marker=".", markersize=1)
-            plt.draw()
+    if cache is None:
+        t, p = positions(x, y, n, K)
+    else:
+        t, p = orbit_gecacht(cache, x, y, n, K)
+    if abgebrochen():                # inzwischen veraltet
+        return None
+    return dichte_hinzufuegen(dichte_anlegen(nbins), t, p)
+
+
+def dichte_eintragen(teil, H=None, bild=None):
+    """GUI-Thread: Teil-Histogramm eines Orbits zu H addieren."""
+    H += teil
+    dichte_aktualisieren(bild, H)
     
 
 if __name__=="__main__":             # Hauptprogramm
     K=2.6                            # Parameter fuer Standardabbildung
+    kicks=1000                       # Punkte pro Orbit
     
         # Benutzerinformationen
     print ("""Waehlen Sie mit Linksklick einen Punkt im Phasenraum"""
     """diagramm aus. Von diesem Punkt aus werden die Koordinaten fuer"""
-    """ 1000 Kicks des Rotors berechnet und geplottet.""")
+    """ %d Kicks des Rotors berechnet und geplottet.""" % kicks)
        
     plt.figure(1)                    # Einrichtung des Fensters
-    plt.subplot(111)                 # und Einrichtung der Achsen
+    ax = plt.subplot(111)            # und Einrichtung der Achsen
     plt.title("phase space diagram for kicked rotor")
     plt.axis([0, 2*np.pi, -np.pi, np.pi])
     plt.xlabel(r"$\theta$", fontsize=20)
     plt.ylabel(r"$p_n$" , fontsize=20)
-    # Einrichten der Mausinteraktion und Endlosschleife
-    plt.connect('button_press_event', mouse_click)
+    H = dichte_anlegen(512)          # Phasenraum-Histogramm als Bild
+    bild = dichte_zeichnen(ax, H)
+    cache = orbit_cache_anlegen()    # bereits berechnete Orbits
+    # Einrichten der Mausinteraktion (Orbits werden in Arbeiter-Threads
+    # berechnet) und Endlosschleife
+    verteiler = klick_verteiler(plt.gcf(),
+                                functools.partial(orbit_dichte, K=K, n=kicks,
+                                                  cache=cache),
+                                functools.partial(dichte_eintragen, H=H,
+                                                  bild=bild))
+    # Nach jedem Zoom den Ausschnitt im Hintergrund verfeinern
+    verfeinerung = verfeinerung_verbinden(ax, K)
     plt.show()
     
 